@@ -0,0 +1,286 @@
+import argparse
+import contextlib
+import dataclasses
+import functools
+import importlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from types import ModuleType
+from typing import Callable, Iterator
+
+import generate
+import memo
+import memory
+
+ROOT = Path(__file__).parent
+PARTS = ("part_1", "part_2")
+SKIP = {
+    ("day14", "part_2"),  # animates the robots in the terminal
+}
+DEFAULT_THRESHOLD = 0.10
+IMPORT_BUDGET = 0.05  # seconds to import a dayNN.main module
+IMPORT_BUDGETS = {  # per-day overrides
+    "day01": 0.25,  # numpy
+    "day02": 0.25,  # numpy
+    "day04": 0.25,  # numpy
+}
+# seconds per part on input.txt, days declare TIME_BUDGET in their main.py to
+# tighten or relax this
+DEFAULT_TIME_BUDGET = 10.0
+
+
+def discover(days: list[str] | None = None) -> Iterator[tuple[str, ModuleType]]:
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+    for day_dir in sorted(ROOT.glob("day[0-9][0-9]")):
+        if days and day_dir.name not in days:
+            continue
+        if (day_dir / "main.py").exists():
+            yield day_dir.name, importlib.import_module(f"{day_dir.name}.main")
+
+
+def parts(day: str, module: ModuleType) -> Iterator[tuple[str, Callable]]:
+    for part in PARTS:
+        func = getattr(module, part, None)
+        if callable(func) and (day, part) not in SKIP:
+            yield part, func
+
+
+def time_budget(module: ModuleType) -> float:
+    return getattr(module, "TIME_BUDGET", DEFAULT_TIME_BUDGET)
+
+
+def inputs(day: str) -> dict[str, Path]:
+    # test.txt, test2.txt, ... are samples, input.txt is the real puzzle input
+    day_dir = ROOT / day
+    files = sorted(day_dir.glob("test*.txt"))
+    if (day_dir / "input.txt").exists():
+        files.append(day_dir / "input.txt")
+    return {f.stem: f for f in files}
+
+
+def sources(
+    day: str, real_only: bool = False, scales: list[float] | None = None, seed: int = 0
+) -> dict[str, Callable[[], str]]:
+    # input name -> loader; scaled inputs come from generate.py instead of files
+    if scales:
+        if day not in generate.GENERATORS:
+            return {}
+        return {
+            f"x{scale:g}": functools.partial(generate.generate, day, scale, seed)
+            for scale in scales
+        }
+    return {
+        name: path.read_text
+        for name, path in inputs(day).items()
+        if not real_only or name == "input"
+    }
+
+
+def measure(func: Callable, s: str, warmup: int, repeats: int) -> list[float]:
+    timings = []
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for i in range(warmup + repeats):
+            start = time.perf_counter()
+            func(s)
+            elapsed = time.perf_counter() - start
+            if i >= warmup:
+                timings.append(elapsed)
+    return timings
+
+
+def summarize(timings: list[float]) -> dict[str, float | int]:
+    if len(timings) > 1:
+        p95 = statistics.quantiles(timings, n=20, method="inclusive")[-1]
+    else:
+        p95 = timings[0]
+    return {
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "p95": p95,
+        "repeats": len(timings),
+    }
+
+
+def measure_memory(func: Callable, s: str, module: ModuleType) -> dict:
+    # sites are the largest allocations near the peak, as location, size, count
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        report = memory.measure(func, s)
+    return {
+        "peak": report.peak,
+        "budget": memory.budget(module),
+        "sites": [dataclasses.asdict(site) for site in report.sites],
+    }
+
+
+def run(
+    days: list[str] | None,
+    warmup: int,
+    repeats: int,
+    real_only: bool = False,
+    track_memory: bool = False,
+    scales: list[float] | None = None,
+    seed: int = 0,
+) -> dict[str, dict]:
+    results = {}
+    for day, module in discover(days):
+        for name, load in sources(day, real_only, scales, seed).items():
+            s = load()
+            for part, func in parts(day, module):
+                key = f"{day}.{part}.{name}"
+                memo.totals.clear()
+                try:
+                    results[key] = summarize(measure(func, s, warmup, repeats))
+                    if memo.totals:
+                        # summed over warmup and repeats
+                        results[key]["memo"] = memo.stats()
+                    if track_memory:
+                        results[key] |= measure_memory(func, s, module)
+                except Exception as e:
+                    results[key] = {"error": f"{type(e).__name__}: {e}"}
+                print(format_result(key, results[key]), file=sys.stderr)
+    return results
+
+
+def format_result(key: str, result: dict) -> str:
+    if "error" in result:
+        return f"{key:<28} {result['error']}"
+    line = (
+        f"{key:<28} min {result['min'] * 1000:>10.3f}ms"
+        f"  median {result['median'] * 1000:>10.3f}ms"
+        f"  p95 {result['p95'] * 1000:>10.3f}ms"
+    )
+    if "peak" in result:
+        line += f"  peak {result['peak'] / memory.MiB:>8.2f}MiB"
+    for name, counts in result.get("memo", {}).items():
+        lookups = counts.get("hits", 0) + counts.get("misses", 0)
+        hit_rate = counts.get("hits", 0) / lookups if lookups else 0.0
+        line += f"  {name} {hit_rate:.0%} hits"
+        if counts.get("evictions"):
+            line += f" {counts['evictions']} evicted"
+    for site in result.get("sites", []):
+        line += f"\n    {memory.Site(**site)}"
+    return line
+
+
+def over_budget(results: dict) -> list[str]:
+    return [k for k, r in results.items() if r.get("peak", 0) > r.get("budget", 0)]
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    regressions = []
+    for key, result in results.items():
+        old = baseline.get(key)
+        if old is None or "median" not in old or "median" not in result:
+            continue
+        ratio = result["median"] / old["median"] if old["median"] else 1.0
+        line = f"{key:<28} {old['median'] * 1000:>10.3f}ms -> "
+        line += f"{result['median'] * 1000:>10.3f}ms  x{ratio:.2f}"
+        if ratio > 1 + threshold:
+            regressions.append(key)
+            line += "  REGRESSION"
+        print(line)
+    return regressions
+
+
+def import_time(day: str) -> float:
+    # cumulative time of the module import as reported by python -X importtime
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {day}.main"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # import time: self [us] | cumulative | imported package
+    for line in proc.stderr.splitlines():
+        if line.count("|") != 2:
+            continue
+        _, cumulative, name = line.split("|")
+        if name.strip() == f"{day}.main":
+            return int(cumulative) / 1_000_000
+    raise RuntimeError(f"{day}.main missing from importtime output")
+
+
+def check_startup(days: list[str] | None, repeats: int) -> list[str]:
+    over_budget = []
+    for day_dir in sorted(ROOT.glob("day[0-9][0-9]")):
+        day = day_dir.name
+        if days and day not in days:
+            continue
+        elapsed = min(import_time(day) for _ in range(repeats))
+        budget = IMPORT_BUDGETS.get(day, IMPORT_BUDGET)
+        line = f"{day:<8} import {elapsed * 1000:>8.1f}ms  budget {budget * 1000:.0f}ms"
+        if elapsed > budget:
+            over_budget.append(day)
+            line += "  OVER BUDGET"
+        print(line)
+    return over_budget
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every day's parts")
+    parser.add_argument("days", nargs="*", help="e.g. day06 day16 (default: all)")
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--real-only", action="store_true", help="skip test inputs")
+    parser.add_argument("-o", "--output", type=Path, default=ROOT / "bench.json")
+    parser.add_argument("--compare", type=Path, help="baseline json to compare with")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument(
+        "--scales",
+        type=float,
+        nargs="+",
+        help="benchmark generated inputs at these scales instead of input files",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="seed for --scales")
+    parser.add_argument(
+        "--memory", action="store_true", help="track peak memory against budgets"
+    )
+    parser.add_argument(
+        "--startup", action="store_true", help="check import times against budgets"
+    )
+    args = parser.parse_args()
+
+    if args.startup:
+        if slow := check_startup(args.days, args.repeats):
+            print(f"{len(slow)} day(s) over the import budget")
+            exit(1)
+        return
+
+    results = run(
+        args.days,
+        args.warmup,
+        args.repeats,
+        args.real_only,
+        args.memory,
+        args.scales,
+        args.seed,
+    )
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "timestamp": time.time(),
+        "results": results,
+    }
+    args.output.write_text(json.dumps(report, indent=4))
+
+    if over := over_budget(results):
+        print(f"Over memory budget: {', '.join(over)}")
+        exit(1)
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())["results"]
+        if regressions := compare(results, baseline, args.threshold):
+            print(f"{len(regressions)} regression(s) over {args.threshold:.0%}")
+            exit(1)
+
+
+if __name__ == "__main__":
+    main()
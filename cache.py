@@ -0,0 +1,153 @@
+# days apply cached_parse at import, so the heavier modules are imported where
+# they are used, keeping every day's startup cheap when caching is off
+import functools
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+ROOT = Path(__file__).resolve().parent
+CACHE_DIR = ROOT / ".cache"
+
+
+def enabled() -> bool:
+    return os.environ.get("AOC_CACHE", "") in ("1", "True", "true")
+
+
+def local_imports(path: Path) -> set[Path]:
+    # modules from this repo imported by the file, e.g. util.py or search.py
+    import ast
+
+    tree = ast.parse(path.read_text())
+    names = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            base = path.parent if node.level else ROOT
+            for _ in range(node.level - 1):
+                base = base.parent
+            names.append(str(base.relative_to(ROOT) / (node.module or "")))
+    found = set()
+    for name in names:
+        module = ROOT / name.replace(".", "/")
+        for candidate in (module.with_suffix(".py"), module / "__init__.py"):
+            if candidate.is_file():
+                found.add(candidate.resolve())
+    return found
+
+
+@functools.cache
+def source_hash(path: Path) -> str:
+    # hash of the file and everything it transitively imports from this repo
+    import hashlib
+
+    seen = set()
+    stack = [path.resolve()]
+    while stack:
+        p = stack.pop()
+        if p in seen:
+            continue
+        seen.add(p)
+        stack.extend(local_imports(p) - seen)
+    digest = hashlib.sha256()
+    for p in sorted(seen):
+        digest.update(str(p.relative_to(ROOT)).encode())
+        digest.update(p.read_bytes())
+    return digest.hexdigest()
+
+
+def input_hash(s: str) -> str:
+    import hashlib
+
+    return hashlib.sha256(s.encode()).hexdigest()
+
+
+def load(path: Path) -> Any:
+    import mmap
+    import pickle
+
+    with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        return pickle.loads(m)
+
+
+def dump(path: Path, value: Any) -> None:
+    import pickle
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_bytes(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    tmp.replace(path)
+
+
+def cached_parse(func: Callable[[str], Any]) -> Callable[[str], Any]:
+    # opt-in with AOC_CACHE=1: parsed input is pickled to disk, keyed by the input
+    # and the source of the parser's module including its local imports
+    @functools.wraps(func)
+    def wrapper(s: str) -> Any:
+        if not enabled() or not isinstance(s, str):
+            # files and streams are read lazily, only puzzle text is cached
+            return func(s)
+        import hashlib
+        import inspect
+
+        source = Path(inspect.getsourcefile(func))
+        key = hashlib.sha256(
+            f"{input_hash(s)}{source_hash(source)}".encode()
+        ).hexdigest()
+        path = CACHE_DIR / "parse" / source.parent.name / f"{func.__qualname__}-{key}"
+        if path.exists():
+            return load(path)
+        value = func(s)
+        dump(path, value)
+        return value
+
+    return wrapper
+
+
+RESULTS_FILE = CACHE_DIR / "results.json"
+MAX_RESULTS = 1024
+
+
+class ResultStore:
+    # answers keyed by (day, part, input, code); least recently used entries are
+    # evicted once there are more than max_entries
+    def __init__(self, path: Path = RESULTS_FILE, max_entries: int = MAX_RESULTS):
+        self.path = path
+        self.max_entries = max_entries
+        import json
+
+        self.entries = json.loads(path.read_text()) if path.exists() else {}
+
+    @staticmethod
+    def key(day: str, part: str, input_file: Path) -> str:
+        import hashlib
+
+        code = source_hash(ROOT / day / "main.py")
+        s = f"{day}|{part}|{input_hash(input_file.read_text())}|{code}"
+        return hashlib.sha256(s.encode()).hexdigest()
+
+    def get(self, key: str) -> dict | None:
+        entry = self.entries.get(key)
+        if entry is not None:
+            entry["used"] = time.time()
+        return entry
+
+    def put(self, key: str, day: str, part: str, answer: str, elapsed: float) -> None:
+        self.entries[key] = {
+            "day": day,
+            "part": part,
+            "answer": answer,
+            "elapsed": elapsed,
+            "used": time.time(),
+        }
+
+    def save(self) -> None:
+        import json
+
+        if len(self.entries) > self.max_entries:
+            by_use = sorted(self.entries, key=lambda k: self.entries[k]["used"])
+            for key in by_use[: len(self.entries) - self.max_entries]:
+                del self.entries[key]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(self.entries, indent=4))
@@ -0,0 +1,156 @@
+import functools
+import importlib
+import json
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+import bench
+import memory
+
+PERF_HISTORY = bench.ROOT / ".perf_history.json"
+PERF_HISTORY_SIZE = 20  # runs kept per part
+PERF_THRESHOLD = 0.25  # allowed slowdown on the median of the history
+PERF_REPEATS = 5  # the fastest of these is recorded, one run is too noisy
+
+_history = {}
+
+
+@pytest.fixture(autouse=True)
+def memory_budget(request, monkeypatch):
+    # with --memory, the part calls of dayNN tests run under tracemalloc and fail
+    # past the day's budget; only the calls are traced, not the test around them
+    package = request.module.__name__.rpartition(".")[0]
+    if not request.config.getoption("memory") or not package.startswith("day"):
+        return
+    budget = memory.budget(importlib.import_module(f"{package}.main"))
+    for name in bench.PARTS:
+        func = getattr(request.module, name, None)
+        if callable(func):
+            monkeypatch.setattr(request.module, name, _traced(func, budget))
+
+
+def _traced(func, budget):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        tracemalloc.start()
+        try:
+            result = func(*args, **kwargs)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert peak <= budget, f"peak {peak / memory.MiB:.2f}MiB over budget"
+        return result
+
+    return wrapper
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--memory", action="store_true", help="check part calls against MEMORY_BUDGET"
+    )
+    group = parser.getgroup("perf", "performance regression gate")
+    group.addoption(
+        "--perf", action="store_true", help="also run every part on input.txt"
+    )
+    group.addoption(
+        "--perf-threshold",
+        type=float,
+        default=PERF_THRESHOLD,
+        help="allowed slowdown relative to the median recorded run",
+    )
+    group.addoption(
+        "--perf-repeats",
+        type=int,
+        default=PERF_REPEATS,
+        help="time each part this many times and keep the fastest",
+    )
+
+
+def pytest_configure(config):
+    if config.getoption("perf") and PERF_HISTORY.exists():
+        _history.update(json.loads(PERF_HISTORY.read_text()))
+
+
+def pytest_sessionfinish(session):
+    if session.config.getoption("perf"):
+        PERF_HISTORY.write_text(json.dumps(_history, indent=4))
+
+
+def pytest_collect_file(file_path, parent):
+    # dayNN/test.py also gets one perf item per part, next to the answer tests
+    if (
+        parent.config.getoption("perf")
+        and file_path.name == "test.py"
+        and file_path.parent.name.startswith("day")
+    ):
+        return PerfFile.from_parent(parent, path=file_path)
+
+
+class PerfFailure(Exception):
+    pass
+
+
+class PerfFile(pytest.File):
+    def collect(self):
+        day = self.path.parent.name
+        module = importlib.import_module(f"{day}.main")
+        for part, func in bench.parts(day, module):
+            yield PerfItem.from_parent(
+                self, name=f"perf_{part}", day=day, module=module, func=func
+            )
+
+
+class PerfItem(pytest.Item):
+    def __init__(self, *, day, module, func, **kwargs):
+        super().__init__(**kwargs)
+        self.day = day
+        self.module = module
+        self.func = func
+
+    def runtest(self):
+        path = bench.inputs(self.day).get("input")
+        if path is None:
+            pytest.skip(f"no {self.day}/input.txt")
+        s = Path(path).read_text()
+        repeats = self.config.getoption("perf_repeats")
+        elapsed = min(bench.measure(self.func, s, 0, repeats))
+        usage = bench.measure_memory(self.func, s, self.module)
+        peak = usage["peak"]
+
+        key = f"{self.day}.{self.name.removeprefix('perf_')}"
+        runs = _history.setdefault(key, [])
+        # the median, not the best, so one lucky run does not fail every later one
+        baseline = statistics.median(r["elapsed"] for r in runs) if runs else None
+        runs.append({"elapsed": elapsed, "peak": peak, "time": time.time()})
+        del runs[:-PERF_HISTORY_SIZE]
+
+        errors = []
+        limit = bench.time_budget(self.module)
+        if elapsed > limit:
+            errors.append(f"took {elapsed:.3f}s, budget {limit:.3f}s")
+        limit = memory.budget(self.module)
+        if peak > limit:
+            errors.append(
+                f"peak {peak / memory.MiB:.2f}MiB, budget {limit / memory.MiB:.2f}MiB"
+                + "".join(f"\n  {memory.Site(**site)}" for site in usage["sites"])
+            )
+        threshold = self.config.getoption("perf_threshold")
+        if baseline is not None and elapsed > baseline * (1 + threshold):
+            errors.append(
+                f"took {elapsed:.3f}s, {elapsed / baseline - 1:+.0%} on the "
+                f"median recorded {baseline:.3f}s"
+            )
+        if errors:
+            raise PerfFailure(f"{key}: " + "; ".join(errors))
+
+    def repr_failure(self, excinfo):
+        if isinstance(excinfo.value, PerfFailure):
+            return str(excinfo.value)
+        return super().repr_failure(excinfo)
+
+    def reportinfo(self):
+        return self.path, None, f"{self.day} {self.name}"
@@ -1,30 +1,206 @@
 # --- Day 1: Historian Hysteria ---
 
+import heapq
+import itertools
+import tempfile
 from pathlib import Path
-from collections import Counter
+from functools import cached_property
+from typing import Callable, Iterator
+
+import numpy as np
+
+import session
+import stream
+from cache import cached_parse
 
 INPUT_FILE = Path(__file__).parent / "input.txt"
+# inputs larger than this are sorted on disk, see ExternalDay01
+EXTERNAL_THRESHOLD = 1024 * 1024 * 1024
+EXTERNAL_BUDGET = 64 * 1024 * 1024
+# rough bytes per input line while a chunk is parsed: the str, its slot in the
+# batch and both int64 values
+LINE_COST = 128
+# run files merged at once; part 1 merges both columns together, so up to twice
+# this many are open
+MERGE_FAN_IN = 64
+
+
+def read_columns(s: stream.Source) -> tuple[np.ndarray, np.ndarray]:
+    # numpy's own text parser splits on any whitespace, so both columns come out
+    # interleaved in one int64 array without a Python object per number
+    if isinstance(s, Path):
+        # reading the text first beats np.fromfile's text mode by about 2x
+        s = s.read_text()
+    elif not isinstance(s, str):
+        s = s.read()
+    values = np.fromstring(s, dtype=np.int64, sep=" ")
+    return values[0::2], values[1::2]
+
+
+@cached_parse
+def parse(s: stream.Source) -> tuple[np.ndarray, np.ndarray]:
+    left, right = read_columns(s)
+    return np.sort(left), np.sort(right)
+
+
+class Day01(session.Session):
+    @cached_property
+    def columns(self) -> tuple[np.ndarray, np.ndarray]:
+        return parse(self.s)
+
+    def part_1(self) -> int:
+        left, right = self.columns
+        return int(np.abs(left - right).sum())
+
+    def part_2(self) -> int:
+        # count of every right value, looked up for all left values at once
+        left, right = self.columns
+        values, counts = np.unique(right, return_counts=True)
+        i = np.searchsorted(values, left).clip(max=len(values) - 1)
+        found = values[i] == left
+        return int((left[found] * counts[i[found]]).sum())
+
+
+def _read_run(path: Path, block: int) -> Iterator[int]:
+    with path.open("rb") as f:
+        while (values := np.fromfile(f, dtype=np.int64, count=block)).size:
+            yield from values.tolist()
+
+
+def _read_table(path: Path, block: int) -> Iterator[tuple[int, int]]:
+    # (value, count) pairs stored interleaved
+    with path.open("rb") as f:
+        while (pairs := np.fromfile(f, dtype=np.int64, count=2 * block)).size:
+            yield from zip(pairs[0::2].tolist(), pairs[1::2].tolist())
+
+
+def _totals(pairs: Iterator[tuple[int, int]]) -> Iterator[tuple[int, int]]:
+    # sums the counts of equal values coming out of a merge of sorted tables
+    for value, group in itertools.groupby(pairs, key=lambda pair: pair[0]):
+        yield value, sum(count for _, count in group)
+
+
+def _merge_runs(paths: list[Path], block: int) -> Iterator[int]:
+    return heapq.merge(*(_read_run(path, block) for path in paths))
+
+
+def _merge_tables(paths: list[Path], block: int) -> Iterator[tuple[int, int]]:
+    return _totals(heapq.merge(*(_read_table(path, block) for path in paths)))
+
+
+def _write(path: Path, items: Iterator, block: int) -> None:
+    # values or (value, count) pairs, the pairs come out interleaved like a table
+    with path.open("wb") as f:
+        for batch in stream.batched(items, block):
+            np.array(batch, dtype=np.int64).tofile(f)
+
+
+class ExternalDay01(session.Session):
+    # out-of-core mode for inputs larger than memory: the input is read in chunks
+    # that fit the budget, each chunk is sorted and spilled to disk as one run per
+    # column plus a (value, count) table per column, and the parts merge the runs
+    # back a block at a time; memory stays around budget whatever the input size.
+    # Past fan_in runs, groups of fan_in are first merged into larger runs, so the
+    # open files stay bounded too
+    def __init__(
+        self,
+        s: stream.Source,
+        budget: int = EXTERNAL_BUDGET,
+        fan_in: int = MERGE_FAN_IN,
+    ):
+        super().__init__(s)
+        self.budget = budget
+        self.fan_in = fan_in
+        self.tmp = tempfile.TemporaryDirectory(prefix="day01-")
+        self.names = itertools.count()
+
+    @cached_property
+    def runs(self) -> list[tuple[Path, Path, Path, Path]]:
+        runs = []
+        chunk_lines = max(1, self.budget // LINE_COST)
+        for i, batch in enumerate(stream.batches(self.s, chunk_lines)):
+            files = []
+            for column, values in zip("lr", read_columns("\n".join(batch))):
+                values.sort()
+                run = Path(self.tmp.name) / f"{i}{column}.run"
+                values.tofile(run)
+                table = run.with_suffix(".table")
+                np.stack(np.unique(values, return_counts=True), axis=1).tofile(table)
+                files += [run, table]
+            runs.append(tuple(files))
+        return runs
+
+    @property
+    def block(self) -> int:
+        # values read per run file at a time; every open run of both columns has
+        # a block in memory during a merge, as Python ints
+        runs = min(len(self.runs), self.fan_in)
+        return max(64, self.budget // (2 * runs * LINE_COST))
+
+    @cached_property
+    def files(self) -> tuple[list[Path], list[Path], list[Path], list[Path]]:
+        # left runs, left tables, right runs, right tables, each down to fan_in
+        left_runs, left_tables, right_runs, right_tables = map(list, zip(*self.runs))
+        return (
+            self._reduce(left_runs, _merge_runs),
+            self._reduce(left_tables, _merge_tables),
+            self._reduce(right_runs, _merge_runs),
+            self._reduce(right_tables, _merge_tables),
+        )
+
+    def _reduce(self, paths: list[Path], merge: Callable) -> list[Path]:
+        # one pass merges every group of fan_in files into one, dividing the count
+        # by fan_in, until a single merge can take them all
+        while len(paths) > self.fan_in:
+            merged = []
+            for group in stream.batched(paths, self.fan_in):
+                if len(group) == 1:
+                    merged += group
+                    continue
+                path = Path(self.tmp.name) / f"m{next(self.names)}{group[0].suffix}"
+                _write(path, merge(group, self.block), self.block)
+                for done in group:
+                    done.unlink()
+                merged.append(path)
+            paths = merged
+        return paths
+
+    def part_1(self) -> int:
+        left_runs, _, right_runs, _ = self.files
+        left = _merge_runs(left_runs, self.block)
+        right = _merge_runs(right_runs, self.block)
+        return sum(abs(a - b) for a, b in zip(left, right))
+
+    def part_2(self) -> int:
+        # merge join of the two frequency tables, both sorted by value
+        _, left_tables, _, right_tables = self.files
+        left = _merge_tables(left_tables, self.block)
+        right = _merge_tables(right_tables, self.block)
+        res = 0
+        r_value, r_count = next(right, (None, 0))
+        for value, count in left:
+            while r_value is not None and r_value < value:
+                r_value, r_count = next(right, (None, 0))
+            if r_value == value:
+                res += value * count * r_count
+        return res
 
 
-def parse(s) -> tuple[list[int], list[int]]:
-    columns = [line.split() for line in s.splitlines()]
-    left = sorted(int(c[0]) for c in columns)
-    right = sorted(int(c[1]) for c in columns)
-    return left, right
+def solver(s: stream.Source) -> session.Session:
+    if isinstance(s, Path) and s.stat().st_size > EXTERNAL_THRESHOLD:
+        return ExternalDay01(s)
+    return Day01(s)
 
 
-def part_1(s: str) -> int:
-    left, right = parse(s)
-    return sum(abs(a - b) for a, b in zip(left, right))
+def part_1(s: stream.Source) -> int:
+    return Day01(s).part_1()
 
 
-def part_2(s: str) -> int:
-    left, right = parse(s)
-    occ = Counter(right)
-    return sum(x * occ[x] for x in left)
+def part_2(s: stream.Source) -> int:
+    return Day01(s).part_2()
 
 
 if __name__ == "__main__":
-    s = INPUT_FILE.read_text()
-    print(f"Part 1: {part_1(s)}")
-    print(f"Part 2: {part_2(s)}")
+    answer_1, answer_2 = solver(INPUT_FILE).solve()
+    print(f"Part 1: {answer_1}")
+    print(f"Part 2: {answer_2}")
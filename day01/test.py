@@ -2,7 +2,7 @@ from pathlib import Path
 
 import pytest
 
-from .main import part_1, part_2
+from .main import LINE_COST, Day01, ExternalDay01, part_1, part_2
 
 TEST_INPUT_FILE = Path(__file__).parent / "test.txt"
 
@@ -19,3 +19,19 @@ def test_part_1(puzzle_test):
 
 def test_part_2(puzzle_test):
     assert part_2(puzzle_test) == 31
+
+
+def test_session(puzzle_test):
+    assert Day01(puzzle_test).solve() == (11, 31)
+
+
+def test_external(puzzle_test):
+    # two lines per run, so the merges see several runs
+    assert ExternalDay01(puzzle_test, budget=2 * LINE_COST).solve() == (11, 31)
+
+
+def test_external_fan_in(puzzle_test):
+    # a run per line merged two at a time, so the runs take several passes
+    solver = ExternalDay01(puzzle_test, budget=LINE_COST, fan_in=2)
+    assert solver.solve() == (11, 31)
+    assert all(len(paths) <= 2 for paths in solver.files)
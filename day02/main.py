@@ -1,76 +1,54 @@
 # --- Day 2: Red-Nosed Reports ---
 
 from pathlib import Path
+from typing import Iterator
 
-INPUT_FILE = Path(__file__).parent / "input.txt"
+import numpy as np
 
+import stream
 
-def part_1(s: str) -> int:
-    reports = map(str.split, s.splitlines())
-    res = 0
-    for r in reports:
-        diff = [int(a) - int(b) for a, b in zip(r, r[1:])]
-        values_ok = all(1 <= abs(level) <= 3 for level in diff)
-        all_positive = all(level > 0 for level in diff)
-        all_negative = all(level < 0 for level in diff)
-        if values_ok and (all_positive or all_negative):
-            res += 1
-    return res
+INPUT_FILE = Path(__file__).parent / "input.txt"
+# reports packed into one matrix at a time
+BATCH_SIZE = 1 << 16
 
 
-increasing = lambda x: x > 0
-decreasing = lambda x: x < 0
-normal = lambda x: 1 <= abs(x) <= 3
+def reports(s: stream.Source) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    # every batch of reports as a matrix padded with zeros on the right plus the
+    # number of levels in each row
+    for batch in stream.batches(s, BATCH_SIZE):
+        lengths = np.fromiter(map(len, map(str.split, batch)), np.int64, len(batch))
+        levels = np.fromstring(" ".join(batch), dtype=np.int64, sep=" ")
+        matrix = np.zeros((len(batch), lengths.max()), dtype=np.int64)
+        matrix[np.arange(matrix.shape[1]) < lengths[:, None]] = levels
+        yield matrix, lengths
 
 
-def is_ok(report):
-    diff = [int(a) - int(b) for a, b in zip(report, report[1:])]
-    if sum(map(increasing, diff)) > sum(map(decreasing, diff)):
-        filt = lambda x: increasing(x) and normal(x)
-    else:
-        filt = lambda x: decreasing(x) and normal(x)
-    values = list(map(filt, diff))
+def safe(matrix: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    # steps past the end of a report pass both checks
+    diff = np.diff(matrix, axis=1)
+    padding = np.arange(diff.shape[1]) >= lengths[:, None] - 1
+    increasing = ((diff >= 1) & (diff <= 3)) | padding
+    decreasing = ((diff <= -1) & (diff >= -3)) | padding
+    return increasing.all(axis=1) | decreasing.all(axis=1)
 
-    distance = sum(not x for x in values)
-    if distance == 0:
-        return True, set()
-    elif 1 <= distance <= 2:
-        # distance == 1 case:
-        # [1, 2, 7] -> [True, False]: [1, 2] -> [True]
-        # distance == 2 case:
-        # [1, 7, 2] -> [False, False]: [1, 2] -> [True]
-        candidates = set()
-        for i, v in enumerate(values):
-            if v:
-                continue
-            candidates.add(i)
-            if i + 1 < len(report):
-                candidates.add(i + 1)
-        return False, candidates
-    else:
-        return False, set()
 
+def part_1(s: stream.Source) -> int:
+    return sum(int(safe(matrix, lengths).sum()) for matrix, lengths in reports(s))
 
-def part_2(s: str) -> int:
-    reports = map(str.split, s.splitlines())
-    res = 0
-    for r in reports:
-        ok, candidates = is_ok(r)
-        if ok:
-            res += 1
-            continue
 
-        for i in candidates:
-            r_copy = r.copy()
-            r_copy.pop(i)
-            ok, _ = is_ok(r_copy)
-            if ok:
-                res += 1
-                break
+def part_2(s: stream.Source) -> int:
+    res = 0
+    for matrix, lengths in reports(s):
+        ok = safe(matrix, lengths)
+        for i in range(matrix.shape[1]):
+            # every report with level i removed at once, rows that are shorter
+            # than i have nothing to remove
+            dampened = safe(np.delete(matrix, i, axis=1), lengths - 1)
+            ok |= dampened & (i < lengths)
+        res += int(ok.sum())
     return res
 
 
 if __name__ == "__main__":
-    s = INPUT_FILE.read_text()
-    print(f"Part 1: {part_1(s)}")
-    print(f"Part 2: {part_2(s)}")
+    print(f"Part 1: {part_1(INPUT_FILE)}")
+    print(f"Part 2: {part_2(INPUT_FILE)}")
@@ -1,37 +1,104 @@
 # --- Day 3: Mull It Over ---
 
-from pathlib import Path
 import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Self
+
+from util import map_file
 
 INPUT_FILE = Path(__file__).parent / "input.txt"
 
+TOKENS = re.compile(rb"mul\((\d+),(\d+)\)|do\(\)|don't\(\)")
+CHUNK_SIZE = 16 * 1024 * 1024
+# how far a chunk may read past its end to finish a token that starts inside it
+OVERLAP = 4096
+
+
+@dataclass(frozen=True)
+class Summary:
+    # a chunk's muls can't all be classified until the state it starts in is known:
+    # head holds the ones before its first toggle, enabled the ones after it that
+    # were enabled, last is the state after its last toggle (None without one)
+    total: int = 0
+    head: int = 0
+    enabled: int = 0
+    last: bool | None = None
+
+    def __add__(self, other: Self) -> Self:
+        # associative, so chunks can be summarized in any grouping and merged in order
+        if self.last is None:
+            return Summary(
+                self.total + other.total,
+                self.head + other.head,
+                other.enabled,
+                other.last,
+            )
+        return Summary(
+            self.total + other.total,
+            self.head,
+            self.enabled + (other.head if self.last else 0) + other.enabled,
+            self.last if other.last is None else other.last,
+        )
+
+    @property
+    def result(self) -> int:
+        # memory starts enabled
+        return self.head + self.enabled
+
+
+def scan_chunk(buf: bytes, start: int, end: int) -> Summary:
+    # tokens belong to the chunk they start in; a suffix of a token is never a
+    # token itself, so starting mid-token can't produce a false match
+    total = head = enabled = 0
+    state = None
+    for m in TOKENS.finditer(buf, start, min(end + OVERLAP, len(buf))):
+        if m.start() >= end:
+            break
+        a, b = m.groups()
+        if a is None:
+            state = m.end() - m.start() == len(b"do()")
+            continue
+        value = int(a) * int(b)
+        total += value
+        if state is None:
+            head += value
+        elif state:
+            enabled += value
+    return Summary(total, head, enabled, state)
+
+
+def scan_file(path: Path, start: int, end: int) -> Summary:
+    # maps the file again in every worker, only the range is sent over
+    return scan_chunk(map_file(path), start, end)
+
+
+def scan(s: str | Path) -> Summary:
+    if isinstance(s, str):
+        buf = s.encode()
+        chunks = range(0, len(buf), CHUNK_SIZE)
+        return sum((scan_chunk(buf, i, i + CHUNK_SIZE) for i in chunks), Summary())
+    # only files are scanned in parallel, str input doesn't pay for the import
+    import multiprocessing
+
+    size = s.stat().st_size
+    ranges = [(s, i, min(i + CHUNK_SIZE, size)) for i in range(0, size, CHUNK_SIZE)]
+    workers = min(len(ranges), multiprocessing.cpu_count())
+    if workers <= 1:
+        return sum((scan_file(*r) for r in ranges), Summary())
+    with multiprocessing.Pool(workers) as pool:
+        return sum(pool.starmap(scan_file, ranges), Summary())
+
 
-def part_1(s: str) -> int:
-    pattern = re.compile(r"mul\((\d+),(\d+)\)")
-    matches = pattern.findall(s)
-    res = sum(int(m[0]) * int(m[1]) for m in matches)
-    return res
+def part_1(s: str | Path) -> int:
+    return scan(s).total
 
 
-def part_2(s: str) -> int:
-    pattern = re.compile(r"(?P<op>mul|do|don't)\(((?P<argv1>\d+),(?P<argv2>\d+))?\)")
-    res = 0
-    do = True
-    for m in pattern.finditer(s):
-        op, argv1, argv2 = m.group("op"), m.group("argv1"), m.group("argv2")
-        match op:
-            case "do":
-                do = True
-            case "don't":
-                do = False
-            case "mul" if do:
-                res += int(argv1) * int(argv2)
-            case _:
-                continue
-    return res
+def part_2(s: str | Path) -> int:
+    return scan(s).result
 
 
 if __name__ == "__main__":
-    s = INPUT_FILE.read_text()
-    print(f"Part 1: {part_1(s)}")
-    print(f"Part 2: {part_2(s)}")
+    summary = scan(INPUT_FILE)
+    print(f"Part 1: {summary.total}")
+    print(f"Part 2: {summary.result}")
@@ -1,8 +1,12 @@
+import multiprocessing
 from pathlib import Path
 
 import pytest
 
-from .main import part_1, part_2
+from generate import generate
+
+from . import main
+from .main import TOKENS, part_1, part_2, scan
 
 TEST_INPUT_FILE = Path(__file__).parent / "test.txt"
 TEST_PART2_INPUT_FILE = Path(__file__).parent / "test2.txt"
@@ -24,3 +28,38 @@ def test_part_1(puzzle_input):
 
 def test_part_2(puzzle_input_part_2):
     assert part_2(puzzle_input_part_2) == 48
+
+
+def reference(s: str) -> tuple[int, int]:
+    # one pass of the regex over the whole text
+    total = result = 0
+    enabled = True
+    for m in TOKENS.finditer(s.encode()):
+        a, b = m.groups()
+        if a is None:
+            enabled = m.group() == b"do()"
+            continue
+        total += int(a) * int(b)
+        result += int(a) * int(b) if enabled else 0
+    return total, result
+
+
+@pytest.mark.parametrize("chunk_size", [7, 13, 100])
+def test_chunks(monkeypatch, puzzle_input_part_2, chunk_size):
+    # chunk boundaries fall inside tokens and between toggles
+    s = puzzle_input_part_2 + generate("day03", 0.1)
+    monkeypatch.setattr(main, "CHUNK_SIZE", chunk_size)
+    summary = scan(s)
+    assert (summary.total, summary.result) == reference(s)
+
+
+@pytest.mark.parametrize("chunk_size", [13, 1000])
+def test_file_chunks(monkeypatch, tmp_path, chunk_size):
+    s = generate("day03", 0.1)
+    path = tmp_path / "input.txt"
+    path.write_text(s)
+    monkeypatch.setattr(main, "CHUNK_SIZE", chunk_size)
+    # a pool even on a single core machine
+    monkeypatch.setattr(multiprocessing, "cpu_count", lambda: 2)
+    summary = scan(path)
+    assert (summary.total, summary.result) == reference(s)
@@ -1,105 +1,68 @@
 # --- Day 4: Ceres Search ---
 from pathlib import Path
-from typing import Iterable
 
-from util import flatten
+import numpy as np
 
 INPUT_FILE = Path(__file__).parent / "input.txt"
 
+# (dy, dx) for rows, columns and both diagonals; backwards words are searched
+# for separately
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
 
-def region(field: list | list[list], m: int, n: int) -> Iterable[list[list]]:
-    if not isinstance(field[0], list):
-        field = [field]
-    for i in range(len(field) - m + 1):
-        for j in range(len(field[0]) - n + 1):
-            matrix = [
-                [field[i + i_offset][j + j_offset] for j_offset in range(n)]
-                for i_offset in range(m)
-            ]
-            yield matrix
-
-
-def _diag_coords(n: int) -> Iterable[list[tuple[int, int]]]:
-    for i in range(n):
-        d = []
-        for j in range(n):
-            if i + j >= n:
-                break
-            d.append((i + j, j))
-        yield d
-        if i != 0:
-            yield [xy[::-1] for xy in d]
-
-
-def diags(field: list[list]) -> list:
-    for d in _diag_coords(len(field)):
-        yield [field[i][j] for i, j in d]
-
-
-class Matrix:
-    def __init__(self, s: str | list[list[str]]):
-        if isinstance(s, str):
-            self.field = [list(line) for line in s.splitlines()]
-        else:
-            self.field = s
-        assert len(self.field) == len(self.field[0])
-
-    def iter_all(self, n: int) -> Iterable[list[str]]:
-        yield from map(flatten, self.region(n, 1))
-        yield from map(flatten, self.region(1, n))
-        for d in self.diags:
-            yield from map(flatten, region(d, 1, n))
-
-    def region(self, m: int, n: int) -> Iterable[list[list[str]]]:
-        return region(self.field, m, n)
-
-    @property
-    def main(self) -> list:
-        main = []
-        for i in range(len(self.field)):
-            main.append(self.field[i][i])
-        return main
-
-    @property
-    def anti(self) -> list:
-        anti = []
-        for i in range(len(self.field)):
-            anti.append(self.field[i][len(self.field) - i - 1])
-        return anti
-
-    @property
-    def diags(self) -> Iterable[list[str]]:
-        main_diags = diags(self.field)
-        anti_diags = diags([line[::-1] for line in self.field])
-        for a, b in zip(main_diags, anti_diags):
-            yield a
-            yield b
+
+def parse(s: str) -> np.ndarray:
+    # one byte per letter, works for any rectangle
+    lines = s.splitlines()
+    return np.frombuffer("".join(lines).encode(), dtype=np.uint8).reshape(
+        len(lines), -1
+    )
+
+
+def letter_masks(grid: np.ndarray, word: str) -> dict[int, np.ndarray]:
+    # each letter is compared against the grid once, searches only AND the masks
+    return {letter: grid == letter for letter in set(word.encode())}
+
+
+def matches(masks: dict[int, np.ndarray], word: str, dy: int, dx: int) -> int:
+    # ANDs the k-th letter's mask shifted k steps along (dy, dx), cropped to the
+    # starts where the whole word fits
+    h, w = next(iter(masks.values())).shape
+    span = len(word) - 1
+    y0, y1 = 0, h - span * dy
+    x0, x1 = max(0, -span * dx), w - max(0, span * dx)
+    if y1 <= y0 or x1 <= x0:
+        return 0
+    letters = word.encode()
+    found = masks[letters[0]][y0:y1, x0:x1].copy()
+    for k, letter in enumerate(letters[1:], 1):
+        found &= masks[letter][y0 + k * dy : y1 + k * dy, x0 + k * dx : x1 + k * dx]
+    return int(np.count_nonzero(found))
 
 
 def part_1(s: str) -> int:
-    matrix = Matrix(s)
-    res = 0
-    xmas = "XMAS"
-    for word in matrix.iter_all(len(xmas)):
-        word = "".join(word)
-        if word == xmas or word[::-1] == xmas:
-            res += 1
-    return res
+    word = "XMAS"
+    masks = letter_masks(parse(s), word)
+    words = {word, word[::-1]}
+    return sum(matches(masks, w, dy, dx) for w in words for dy, dx in DIRECTIONS)
 
 
 def part_2(s: str) -> int:
-    search = Matrix(s)
-    res = 0
-    word = "MAS"
-    for matrix in search.region(3, 3):
-        matrix = Matrix(matrix)
-        main = "".join(matrix.main)
-        anti = "".join(matrix.anti)
-        if (main == word or main[::-1] == word) and (
-            anti == word or anti[::-1] == word
-        ):
-            res += 1
-    return res
+    # every 3x3 window at once: its centre and corners are shifted views
+    grid = parse(s)
+    if min(grid.shape) < 3:
+        return 0
+    first, middle, last = "MAS".encode()
+    centre = grid[1:-1, 1:-1]
+    top_left, top_right = grid[:-2, :-2], grid[:-2, 2:]
+    bottom_left, bottom_right = grid[2:, :-2], grid[2:, 2:]
+
+    def mas(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        return ((a == first) & (b == last)) | ((a == last) & (b == first))
+
+    found = (
+        (centre == middle) & mas(top_left, bottom_right) & mas(top_right, bottom_left)
+    )
+    return int(np.count_nonzero(found))
 
 
 if __name__ == "__main__":
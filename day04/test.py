@@ -18,3 +18,14 @@ def test_part_1(puzzle_input):
 
 def test_part_2(puzzle_input):
     assert part_2(puzzle_input) == 9
+
+
+# the same 3x7 letters and their 7x3 transpose: three XMAS along the long side,
+# one of them backwards, and one X-MAS in the top left corner either way
+WIDE = "MXMASAM\nXAXMASA\nSMSAMXS\n"
+TALL = "MXS\nXAM\nMXS\nAMA\nSAM\nASX\nMAS\n"
+
+
+@pytest.mark.parametrize("s", [WIDE, TALL], ids=["3x7", "7x3"])
+def test_rectangle(s):
+    assert (part_1(s), part_2(s)) == (3, 1)
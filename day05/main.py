@@ -3,9 +3,12 @@ from collections import defaultdict
 from copy import deepcopy
 from pathlib import Path
 
+from cache import cached_parse
+
 INPUT_FILE = Path(__file__).parent / "input.txt"
 
 
+@cached_parse
 def parse(s: str) -> tuple[dict[int, set[int]], list[list[int]]]:
     rules_lines, update_lines = s.split("\n\n")
 
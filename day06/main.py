@@ -1,22 +1,24 @@
 # --- Day 6: Guard Gallivant ---
 from collections import defaultdict
-from copy import deepcopy
+from functools import cached_property
 from pathlib import Path
-from util import Grid, Vec
 
-import tqdm
+import instrument
+import session
+from util import OUTSIDE, Grid, Overlay, Vec
 
 INPUT_FILE = Path(__file__).parent / "input.txt"
 
 
-def traverse(grid: Grid, pos: Vec, direction: Vec):
+def traverse(grid: Grid | Overlay, pos: Vec, direction: Vec):
     visited = defaultdict(set)
     visited[pos].add(direction)
     while True:
         next_pos = pos + direction
-        if grid.oob(next_pos):
+        cell = grid[next_pos]
+        if cell is OUTSIDE:
             break
-        elif grid[next_pos] == "#":
+        elif cell == "#":
             direction = direction.rot(90)
             continue
 
@@ -28,41 +30,62 @@ def traverse(grid: Grid, pos: Vec, direction: Vec):
     return visited, True
 
 
+class Day06(session.Session):
+    @cached_property
+    def grid(self) -> Grid:
+        return Grid.from_string(self.s, padded=True)
+
+    @cached_property
+    def start(self) -> tuple[Vec, Vec]:
+        return self.grid.find("^"), Vec(y=-1, x=0)
+
+    @cached_property
+    def path(self) -> dict[Vec, set[Vec]]:
+        # the guard's unobstructed route, the only cells where an obstacle matters
+        with instrument.phase("day06.path"):
+            visited, _ = traverse(self.grid, *self.start)
+        return visited
+
+    def part_1(self) -> int:
+        return len(self.path)
+
+    def part_2(self) -> int:
+        orig_pos, orig_direction = self.start
+        overlay = Overlay(self.grid)
+        res = 0
+        candidates = self.path.items()
+        for pos, directions in instrument.progress(
+            candidates, "day06.candidates", len(candidates)
+        ):
+            for direction in directions:
+                # TODO: keep track of time when pos was entered from direction
+                # TODO: check if placing rock at step N will break the timeline
+                # TODO: (guard visited this square before)
+                # TODO: otherwise try to travers as normal; if at some point pos and
+                # TODO: direction line up with previous path, then we entered the loop
+                # TODO: loop itself can be pretty complicated
+                # TODO: this will still require a lot of compute
+                overlay[pos] = "#"
+                _, has_exit = traverse(overlay, orig_pos, orig_direction)
+                overlay.rollback()
+                instrument.count("day06.traversals")
+                if not has_exit:
+                    res += 1
+                    break
+
+        return res
+
+
 def part_1(s: str) -> int:
-    grid = Grid.from_string(s)
-    pos = grid.find("^")
-    direction = Vec(y=-1, x=0)
-    visited, _ = traverse(grid, pos, direction)
-    return len(visited)
+    return Day06(s).part_1()
 
 
 def part_2(s: str) -> int:
-    grid = Grid.from_string(s)
-    orig_pos = grid.find("^")
-    orig_direction = Vec(y=-1, x=0)
-    visited, _ = traverse(grid, orig_pos, orig_direction)
-
-    res = 0
-    for pos, directions in tqdm.tqdm(visited.items()):
-        for direction in directions:
-            # TODO: keep track of time when pos was entered from direction
-            # TODO: check if placing rock at step N will break the timeline
-            # TODO: (guard visited this square before)
-            # TODO: otherwise try to travers as normal; if at some point pos and
-            # TODO: direction line up with previous path, then we entered the loop
-            # TODO: loop itself can be pretty complicated
-            # TODO: this will still require a lot of compute
-            grid_c = deepcopy(grid)
-            grid_c[pos] = "#"
-            _, has_exit = traverse(grid_c, orig_pos, orig_direction)
-            if not has_exit:
-                res += 1
-                break
-
-    return res
+    return Day06(s).part_2()
 
 
 if __name__ == "__main__":
     s = INPUT_FILE.read_text()
-    print(f"Part 1: {part_1(s)}")
-    print(f"Part 2: {part_2(s)}")
+    answer_1, answer_2 = Day06(s).solve()
+    print(f"Part 1: {answer_1}")
+    print(f"Part 2: {answer_2}")
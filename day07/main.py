@@ -2,18 +2,22 @@
 import itertools
 from operator import mul, add
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Iterator
+
+import stream
 
 INPUT_FILE = Path(__file__).parent / "input.txt"
+# part 2 tries every operator combination
+TIME_BUDGET = 120.0
+
+
+def parse_line(line: str) -> tuple[int, list[int]]:
+    result, nums = line.split(": ")
+    return int(result), [int(num) for num in nums.split()]
 
 
-def parse(s: str) -> list[tuple[int, list[int]]]:
-    vals = []
-    for line in s.splitlines():
-        result, nums = line.split(": ")
-        nums = [int(num) for num in nums.split()]
-        vals.append((int(result), nums))
-    return vals
+def parse(s: stream.Source) -> Iterator[tuple[int, list[int]]]:
+    return stream.records(s, parse_line)
 
 
 def is_valid(
@@ -29,7 +33,7 @@ def is_valid(
     return False
 
 
-def part_1(s: str) -> int:
+def part_1(s: stream.Source) -> int:
     vals = parse(s)
     ops = [mul, add]
     res = sum(result for result, nums in vals if is_valid(result, nums, ops))
@@ -40,7 +44,7 @@ def concat(a: int, b: int) -> int:
     return int(f"{a}{b}")
 
 
-def part_2(s: str) -> int:
+def part_2(s: stream.Source) -> int:
     vals = parse(s)
     ops = [mul, add, concat]
     res = sum(result for result, nums in vals if is_valid(result, nums, ops))
@@ -48,6 +52,5 @@ def part_2(s: str) -> int:
 
 
 if __name__ == "__main__":
-    s = INPUT_FILE.read_text()
-    print(f"Part 1: {part_1(s)}")
-    print(f"Part 2: {part_2(s)}")
+    print(f"Part 1: {part_1(INPUT_FILE)}")
+    print(f"Part 2: {part_2(INPUT_FILE)}")
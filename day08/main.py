@@ -6,15 +6,17 @@ from util import Grid, Vec
 INPUT_FILE = Path(__file__).parent / "input.txt"
 
 
-def parse(s: str) -> tuple[Grid, dict[str, list[Vec]]]:
-    grid = Grid.from_string(s)
+def parse(s: str | Path) -> tuple[Grid, dict[str, list[Vec]]]:
+    # the map is only read, so a file is used in place as an mmap view
+    grid = Grid.from_file(s) if isinstance(s, Path) else Grid.from_string(s)
+    grid.build_index()
     freqs = dict()
-    for freq in set(s) - {".", "\n"}:
+    for freq in grid.counts().keys() - {"."}:
         freqs[freq] = list(grid.find_iter(freq))
     return grid, freqs
 
 
-def part_1(s: str) -> int:
+def part_1(s: str | Path) -> int:
     grid, freqs = parse(s)
     antinodes = set()
     for freq, positions in freqs.items():
@@ -25,7 +27,7 @@ def part_1(s: str) -> int:
     return sum(not grid.oob(pos) for pos in antinodes)
 
 
-def part_2(s: str) -> int:
+def part_2(s: str | Path) -> int:
     grid, freqs = parse(s)
     antinodes = set(itertools.chain.from_iterable(freqs.values()))
     for freq, positions in freqs.items():
@@ -38,6 +40,5 @@ def part_2(s: str) -> int:
 
 
 if __name__ == "__main__":
-    s = INPUT_FILE.read_text()
-    print(f"Part 1: {part_1(s)}")
-    print(f"Part 2: {part_2(s)}")
+    print(f"Part 1: {part_1(INPUT_FILE)}")
+    print(f"Part 2: {part_2(INPUT_FILE)}")
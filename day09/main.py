@@ -3,6 +3,8 @@
 from pathlib import Path
 
 INPUT_FILE = Path(__file__).parent / "input.txt"
+# part 1 expands the disk map into one list slot per block
+MEMORY_BUDGET = 32 * 1024 * 1024
 
 
 def part_1(s: str) -> int:
@@ -11,10 +11,12 @@ INPUT_FILE = Path(__file__).parent / "input.txt"
 class TopologyMap(Grid):
     @classmethod
     def from_string(cls, s: str) -> Self:
-        tm = super().from_string(s)
-        for i, row in enumerate(tm.grid):
-            tm.grid[i] = [int(v) if v != "." else -1 for v in row]
-        return tm
+        # a -1 border is never one step up from anything
+        return cls(
+            [[int(v) if v != "." else -1 for v in row] for row in s.splitlines()],
+            padded=True,
+            border=-1,
+        ).build_index()
 
     def bfs_iter(self, start: Vec, adj_func) -> Iterator[Vec]:
         q = deque()
@@ -45,10 +47,7 @@ class TopologyMap(Grid):
 
 
 def good_adj(grid: TopologyMap, pos: Vec) -> Iterator[Vec]:
-    adj = (pos + Vec(0, 1), pos + Vec(0, -1), pos + Vec(1, 0), pos + Vec(-1, 0))
-    for node in adj:
-        if grid.oob(node):
-            continue
+    for node in pos.neighbours():
         delta = grid[node] - grid[pos]
         if delta == 1:
             yield node
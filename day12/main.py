@@ -4,17 +4,10 @@ from collections import defaultdict
 from pathlib import Path
 from typing import Iterator
 
-from util import Vec, Grid
+from util import DIRECTIONS, OUTSIDE, Grid, Vec
 
 INPUT_FILE = Path(__file__).parent / "test.txt"
 
-DIRECTIONS = (
-    Vec(0, 1),
-    Vec(0, -1),
-    Vec(1, 0),
-    Vec(-1, 0),
-)
-
 CORNERS_EDGES = (
     (Vec(x=0, y=1), Vec(x=1, y=0)),
     (Vec(x=0, y=1).rot(90), Vec(x=1, y=0).rot(90)),
@@ -24,14 +17,14 @@ CORNERS_EDGES = (
 
 
 class Garden(Grid):
-    def __init__(self, grid: list[list]):
-        super().__init__(grid)
+    def __init__(self, grid: list[list], padded: bool = False, border=OUTSIDE):
+        super().__init__(grid, padded, border)
         self.region_grid = Grid([[None] * len(row) for row in grid])
         self.region_list = []
         self._region_count = 0
 
-        for y in range(len(self.grid)):
-            for x in range(len(self.grid)):
+        for y in range(self.height):
+            for x in range(self.width):
                 pos = Vec(x, y)
                 self._fill_region(pos)
 
@@ -55,8 +48,9 @@ class Garden(Grid):
         self._region_count += 1
 
     def _region_neighbours(self, pos: Vec) -> Iterator[Vec]:
+        # relies on the border, which never equals a plant
         for node in neighbours(pos):
-            if not self.oob(node) and self[node] == self[pos]:
+            if self[node] == self[pos]:
                 yield node
 
     def region_of(self, pos: Vec) -> int | None:
@@ -64,7 +58,7 @@ class Garden(Grid):
 
 
 def neighbours(pos: Vec) -> list[Vec]:
-    return [pos + d for d in DIRECTIONS]
+    return pos.neighbours()
 
 
 def neighbours_directions(pos: Vec) -> list[tuple[Vec, Vec]]:
@@ -72,7 +66,7 @@ def neighbours_directions(pos: Vec) -> list[tuple[Vec, Vec]]:
 
 
 def part_1(s: str) -> int:
-    garden = Garden.from_string(s)
+    garden = Garden.from_string(s, padded=True)
     res = 0
     for region_id, region in garden.region_list:
         perimeter = 0
@@ -85,7 +79,7 @@ def part_1(s: str) -> int:
 
 
 def part_2(s: str) -> int:
-    garden = Garden.from_string(s)
+    garden = Garden.from_string(s, padded=True)
 
     res = 0
     for region_id, region_nodes in garden.region_list:
@@ -1,16 +1,17 @@
 # --- Day 13: Claw Contraption ---
 import re
 from pathlib import Path
+from typing import Iterator
 
+import stream
 from util import Vec
 
 INPUT_FILE = Path(__file__).parent / "input.txt"
 
 
-def parse(s: str):
-    blocks = [block.splitlines() for block in s.split("\n\n")]
-    machines = [list(map(parse_vec, block)) for block in blocks]
-    return machines
+def parse(s: stream.Source) -> Iterator[list[Vec]]:
+    for block in stream.blocks(s):
+        yield list(map(parse_vec, block))
 
 
 def parse_vec(line: str) -> Vec:
@@ -26,12 +27,12 @@ def solve(a, b, target) -> int:
     return 0
 
 
-def part_1(s: str) -> int:
+def part_1(s: stream.Source) -> int:
     machines = parse(s)
     return sum(solve(*m) for m in machines)
 
 
-def part_2(s: str) -> int:
+def part_2(s: stream.Source) -> int:
     machines = parse(s)
     return sum(
         solve(a, b, prize + Vec(10000000000000, 10000000000000))
@@ -40,6 +41,5 @@ def part_2(s: str) -> int:
 
 
 if __name__ == "__main__":
-    s = INPUT_FILE.read_text()
-    print(f"Part 1: {part_1(s)}")
-    print(f"Part 2: {part_2(s)}")
+    print(f"Part 1: {part_1(INPUT_FILE)}")
+    print(f"Part 2: {part_2(INPUT_FILE)}")
@@ -55,7 +55,11 @@ def parse(s: str):
     grid, moves = s.split("\n\n")
     moves = moves.replace("\n", "")
     moves = list(map(Action, moves))
-    grid = Grid([list(map(Node, row)) for row in grid.splitlines()])
+    grid = Grid(
+        [list(map(Node, row)) for row in grid.splitlines()],
+        padded=True,
+        border=Node.WALL,
+    )
     return grid, moves
 
 
@@ -68,14 +72,11 @@ def part_1(s: str) -> int:
         next_pos = robot
         while True:
             next_pos += move.vec()
-            if grid.oob(next_pos):
-                next_pos = None
-                break
             if grid[next_pos] != Node.BOX:
                 break
             boxes.append(next_pos)
 
-        if next_pos is None or grid[next_pos] != Node.SPACE:
+        if grid[next_pos] != Node.SPACE:
             continue
 
         for box in reversed(boxes):
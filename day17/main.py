@@ -4,8 +4,6 @@ from enum import Enum
 from pathlib import Path
 from typing import Self
 
-import z3
-
 INPUT_FILE = Path(__file__).parent / "input.txt"
 
 
@@ -139,6 +137,9 @@ def part_1(s: str) -> str:
 
 
 def part_2(s: str) -> int:
+    # z3 takes a while to import and part 1 does not need it
+    import z3
+
     computer = Computer.from_string(s)
 
     def run_vm(a: int, debug: bool = False) -> list[int]:
@@ -1,7 +1,8 @@
 # --- Day 19: Linen Layout ---
-import functools
 from pathlib import Path
 
+from memo import memoize
+
 INPUT_FILE = Path(__file__).parent / "input.txt"
 
 
@@ -32,13 +33,14 @@ def part_1(s: str) -> int:
 def part_2(s: str) -> int:
     patterns, designs = parse(s)
 
-    @functools.cache
+    @memoize(name="day19.arrangements")
     def solve(d: str) -> int:
         if not d:
             return 1
         return sum(solve(d.removeprefix(p)) for p in patterns if d.startswith(p))
 
-    return sum(solve(design) for design in designs)
+    with solve.scope():
+        return sum(solve(design) for design in designs)
 
 
 if __name__ == "__main__":
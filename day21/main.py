@@ -1,23 +1,17 @@
 # --- Day 21: Keypad Conundrum ---
 # this is a mess
-import collections
 import functools
 import itertools
 from collections import defaultdict
-from copy import deepcopy
 from pathlib import Path
-from typing import Self
+from typing import Iterator, Self
 
+from memo import Memo
+from search import bfs, shortest_paths
 from util import Grid, Vec
 
 INPUT_FILE = Path(__file__).parent / "input.txt"
 
-DIRECTIONS = (
-    Vec(0, 1),
-    Vec(0, -1),
-    Vec(1, 0),
-    Vec(-1, 0),
-)
 DIRECTIONS_MAPPING = {Vec(0, 1): "v", Vec(0, -1): "^", Vec(1, 0): ">", Vec(-1, 0): "<"}
 
 
@@ -34,55 +28,20 @@ class Keypad(Grid):
             if button is not None:
                 yield pos, button
 
-    def _calc_distance(self, start: Vec) -> None:
-        distances = {
-            Vec(x, y): float("inf")
-            for y in range(self.height)
-            for x in range(self.width)
-        }
-        distances[start] = 0.0
-        unvisited = set(distances.keys())
-        prev = defaultdict(list)
-
-        while unvisited:
-            pos, distance = min(
-                ((k, v) for k, v in distances.items() if k in unvisited),
-                key=lambda x: x[1],
-            )
-            unvisited.remove(pos)
-
-            for direction in DIRECTIONS:
-                new_pos = pos + direction
-                if new_pos not in unvisited or self[new_pos] is None:
-                    continue
-
-                old_distance = distances[new_pos]
-                new_distance = distance + 1
-                if new_distance < old_distance:
-                    distances[new_pos] = new_distance
-                    prev[new_pos] = [pos]
-                elif new_distance == old_distance:
-                    prev[new_pos].append(pos)
+    def neighbours(self, pos: Vec) -> Iterator[Vec]:
+        for new_pos in pos.neighbours():
+            if self.get(new_pos) is not None:
+                yield new_pos
 
+    def _calc_distance(self, start: Vec) -> None:
+        _, prev = bfs(start, self.neighbours)
         for pos, button in self.items():
-            if button is None:
+            if pos == start:
                 continue
-            paths = list(self._calc_paths(pos, start, prev))
-            self.mapping[self[start]][button] = paths
-
-    def _calc_paths(
-        self, start: Vec, end: Vec, prev: dict[Vec, list[Vec]]
-    ) -> list[list[Vec]]:
-        q = collections.deque([[start]])
-        while q:
-            path = q.pop()
-            pos = path[-1]
-            if pos == end and len(path) > 1:
-                yield list(a - b for a, b in itertools.pairwise(path))[::-1]
-            for neighbour in prev[pos]:
-                new_path = deepcopy(path)
-                new_path.append(neighbour)
-                q.append(new_path)
+            paths = shortest_paths(prev, start, pos)
+            self.mapping[self[start]][button] = [
+                [b - a for a, b in itertools.pairwise(path)] for path in paths
+            ]
 
     def get_sequences_raw(self, start: str, end: str) -> list[list[Vec]]:
         return self.mapping[start][end]
@@ -104,34 +63,41 @@ class Keypad(Grid):
         return [seq for score, seq in weighted if score == best]
 
 
-NUMERIC_KEYPAD = Keypad(
-    [
-        ["7", "8", "9"],
-        ["4", "5", "6"],
-        ["1", "2", "3"],
-        [None, "0", "A"],
-    ],
-)
-
-DIRECTIONAL_KEYPAD = Keypad(
-    [
-        [None, "^", "A"],
-        ["<", "v", ">"],
-    ]
-)
+# every keypad runs a search from each button, so build them on first use
+@functools.cache
+def numeric_keypad() -> Keypad:
+    return Keypad(
+        [
+            ["7", "8", "9"],
+            ["4", "5", "6"],
+            ["1", "2", "3"],
+            [None, "0", "A"],
+        ],
+    )
+
+
+@functools.cache
+def directional_keypad() -> Keypad:
+    return Keypad(
+        [
+            [None, "^", "A"],
+            ["<", "v", ">"],
+        ]
+    )
 
 
 class KeypadStack:
     def __init__(self, keypads: list[Keypad]):
         self.keypad = keypads[0]
         self.next_stack = KeypadStack(keypads[1:]) if len(keypads) > 1 else None
+        # per instance, so the memo goes away with the stack
+        self.best_sequence = Memo(self._best_sequence, name="day21.best_sequence")
 
     @classmethod
     def from_count(cls, n: int) -> Self:
-        return cls([NUMERIC_KEYPAD, *[DIRECTIONAL_KEYPAD for _ in range(n)]])
+        return cls([numeric_keypad(), *[directional_keypad() for _ in range(n)]])
 
-    @functools.cache
-    def best_sequence(self, start: str, end: str) -> int:
+    def _best_sequence(self, start: str, end: str) -> int:
         if self.next_stack is None:
             return len(self.keypad.get_sequences_best(start, end)[0])
         sequences = self.keypad.get_sequences_best(start, end)
@@ -2,8 +2,16 @@
 import collections
 import itertools
 from pathlib import Path
+from typing import Iterator
+
+import stream
+from util import iter_lines, map_file
 
 INPUT_FILE = Path(__file__).parent / "input.txt"
+# one Counter entry per distinct run of four price changes
+MEMORY_BUDGET = 128 * 1024 * 1024
+# 2000 price steps for every buyer
+TIME_BUDGET = 60.0
 
 
 def sliding_window(iterable, n):
@@ -43,16 +51,27 @@ class RNGGenerator:
         return self.cur
 
 
-def part_1(s: str) -> int:
+def seeds(s: stream.Source) -> Iterator[int]:
+    if isinstance(s, Path):
+        # straight from the mapped file, no decoded text or str per line; the
+        # mapping is left to be closed once the line views are gone
+        for line in iter_lines(map_file(s)):
+            if line:
+                yield int(bytes(line))
+        return
+    yield from stream.records(s, int)
+
+
+def part_1(s: stream.Source) -> int:
     res = 0
-    for seed in map(int, s.splitlines()):
+    for seed in seeds(s):
         res += RNGGenerator(seed).nth(2000)
     return res
 
 
-def part_2(s: str) -> int:
+def part_2(s: stream.Source) -> int:
     sequences_scores = collections.Counter()
-    for seed in map(int, s.splitlines()):
+    for seed in seeds(s):
         gen = RNGGenerator(seed)
         seen = set()
         for seq in sliding_window(itertools.islice(gen, 2000), n=4):
@@ -66,6 +85,5 @@ def part_2(s: str) -> int:
 
 
 if __name__ == "__main__":
-    s = INPUT_FILE.read_text()
-    print(f"Part 1: {part_1(s)}")
-    print(f"Part 2: {part_2(s)}")
+    print(f"Part 1: {part_1(INPUT_FILE)}")
+    print(f"Part 2: {part_2(INPUT_FILE)}")
@@ -18,3 +18,7 @@ def test_part_1(puzzle_input):
 
 def test_part_2(puzzle_input):
     assert part_2(puzzle_input) == 24
+
+
+def test_file_input():
+    assert (part_1(TEST_INPUT_FILE), part_2(TEST_INPUT_FILE)) == (37327623, 24)
@@ -0,0 +1,324 @@
+# Synthetic puzzle inputs for stress testing. scale=1 is roughly the size of a real
+# input; line based inputs grow linearly with scale, grids grow in side length.
+import argparse
+import random
+import sys
+from typing import Callable
+
+DIRECTIONS = ((0, 1), (0, -1), (1, 0), (-1, 0))
+
+
+def day01(scale: float, rng: random.Random) -> str:
+    lines = (
+        f"{rng.randint(10000, 99999)}   {rng.randint(10000, 99999)}"
+        for _ in range(int(1000 * scale))
+    )
+    return "\n".join(lines) + "\n"
+
+
+def day02(scale: float, rng: random.Random) -> str:
+    lines = []
+    for _ in range(int(1000 * scale)):
+        level = rng.randint(1, 90)
+        sign = rng.choice((-1, 1))
+        report = [level]
+        for _ in range(rng.randint(4, 7)):
+            # mostly safe steps with an occasional bad one
+            step = rng.randint(1, 3) if rng.random() < 0.9 else rng.randint(-2, 6)
+            report.append(max(1, report[-1] + sign * step))
+        lines.append(" ".join(map(str, report)))
+    return "\n".join(lines) + "\n"
+
+
+def day03(scale: float, rng: random.Random) -> str:
+    junk = "mul(,)don't()x[]{}@#$%^&*!?<>:;' "
+    parts = []
+    size = 0
+    while size < 18000 * scale:
+        roll = rng.random()
+        if roll < 0.08:
+            token = f"mul({rng.randint(1, 999)},{rng.randint(1, 999)})"
+        elif roll < 0.09:
+            token = rng.choice(("do()", "don't()"))
+        else:
+            token = "".join(rng.choices(junk, k=rng.randint(1, 6)))
+        parts.append(token)
+        size += len(token)
+    return "".join(parts) + "\n"
+
+
+def _grid(rows: list[list[str]]) -> str:
+    return "\n".join(map("".join, rows)) + "\n"
+
+
+def day04(scale: float, rng: random.Random) -> str:
+    n = int(140 * scale)
+    return _grid([rng.choices("XMAS", k=n) for _ in range(n)])
+
+
+def day05(scale: float, rng: random.Random) -> str:
+    # rules cover every pair of pages, like the real input, so any update can be
+    # put in order; about half the updates already are
+    pages = rng.sample(range(10, 100), 49)
+    rules = [f"{a}|{b}" for i, a in enumerate(pages) for b in pages[i + 1 :]]
+    rng.shuffle(rules)
+    updates = []
+    for _ in range(int(200 * scale)):
+        update = rng.sample(pages, rng.randrange(5, 24, 2))
+        if rng.random() < 0.5:
+            update.sort(key=pages.index)
+        updates.append(",".join(map(str, update)))
+    return "\n".join(rules) + "\n\n" + "\n".join(updates) + "\n"
+
+
+def day06(scale: float, rng: random.Random) -> str:
+    # obstacles steer the guard along an inward spiral, so the patrol covers a fixed
+    # share of the map at every scale and seed; noise stays off the spiral
+    n = int(130 * scale)
+    gap = 6
+    rows = [["."] * n for _ in range(n)]
+    path = set()
+    left, top, right, bottom = 1, 1, n - 2, n - 2
+    x, y = left, bottom
+    rows[y][x] = "^"
+    while right - left > 2 * gap and bottom - top > 2 * gap:
+        path.update((x, i) for i in range(top, y + 1))
+        rows[top - 1][x] = "#"
+        y = top
+        path.update((i, y) for i in range(x, right + 1))
+        rows[y][right + 1] = "#"
+        x = right
+        path.update((x, i) for i in range(y, bottom + 1))
+        rows[bottom + 1][x] = "#"
+        y = bottom
+        left += gap
+        path.update((i, y) for i in range(left, x + 1))
+        rows[y][left - 1] = "#"
+        x = left
+        top, right, bottom = top + gap, right - gap, bottom - gap
+    for j in range(n):
+        for i in range(n):
+            if rows[j][i] == "." and (i, j) not in path and rng.random() < 0.015:
+                rows[j][i] = "#"
+    return _grid(rows)
+
+
+def day07(scale: float, rng: random.Random) -> str:
+    lines = []
+    for _ in range(int(850 * scale)):
+        nums = [rng.randint(1, 999) for _ in range(rng.randint(3, 12))]
+        result = nums[0]
+        for num in nums[1:]:
+            match rng.randrange(3):
+                case 0:
+                    result += num
+                case 1:
+                    result *= num
+                case 2:
+                    result = int(f"{result}{num}")
+        if rng.random() < 0.5:
+            result += rng.randint(1, 9)
+        lines.append(f"{result}: {' '.join(map(str, nums))}")
+    return "\n".join(lines) + "\n"
+
+
+def day08(scale: float, rng: random.Random) -> str:
+    n = int(50 * scale)
+    rows = [["."] * n for _ in range(n)]
+    freqs = "0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    for _ in range(n * n // 12):
+        rows[rng.randrange(n)][rng.randrange(n)] = rng.choice(freqs)
+    return _grid(rows)
+
+
+def day09(scale: float, rng: random.Random) -> str:
+    n = int(10000 * scale)
+    digits = []
+    for i in range(n):
+        digits.append(str(rng.randint(1, 9)))
+        if i != n - 1:
+            digits.append(str(rng.randint(0, 9)))
+    return "".join(digits) + "\n"
+
+
+def day10(scale: float, rng: random.Random) -> str:
+    # uniform digits almost never line up 0 to 9, so ascending trails are walked
+    # into the noise; later trails may cut earlier ones, most survive
+    n = int(50 * scale)
+    rows = [rng.choices("0123456789", k=n) for _ in range(n)]
+    for _ in range(n * n // 40):
+        x, y = rng.randrange(n), rng.randrange(n)
+        trail = [(x, y)]
+        while len(trail) < 10:
+            x, y = trail[-1]
+            options = [
+                (x + dx, y + dy)
+                for dx, dy in DIRECTIONS
+                if 0 <= x + dx < n and 0 <= y + dy < n and (x + dx, y + dy) not in trail
+            ]
+            if not options:
+                # walked into a dead end, the trail stays short
+                break
+            trail.append(rng.choice(options))
+        for height, (x, y) in enumerate(trail):
+            rows[y][x] = str(height)
+    return _grid(rows)
+
+
+def day11(scale: float, rng: random.Random) -> str:
+    return " ".join(str(rng.randint(0, 10**7)) for _ in range(int(8 * scale))) + "\n"
+
+
+def day12(scale: float, rng: random.Random) -> str:
+    # blocks of plants with some noise, so regions have interesting shapes
+    n = int(140 * scale)
+    letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    blocks = {}
+    rows = []
+    for y in range(n):
+        row = []
+        for x in range(n):
+            block = (x // 5, y // 5)
+            if block not in blocks:
+                blocks[block] = rng.choice(letters)
+            row.append(rng.choice(letters) if rng.random() < 0.1 else blocks[block])
+        rows.append(row)
+    return _grid(rows)
+
+
+def day13(scale: float, rng: random.Random) -> str:
+    machines = []
+    for _ in range(int(320 * scale)):
+        ax, ay, bx, by = (rng.randint(10, 99) for _ in range(4))
+        if rng.random() < 0.5:
+            a, b = rng.randint(1, 100), rng.randint(1, 100)
+            px, py = a * ax + b * bx, a * ay + b * by
+        else:
+            px, py = rng.randint(1000, 20000), rng.randint(1000, 20000)
+        machines.append(
+            f"Button A: X+{ax}, Y+{ay}\nButton B: X+{bx}, Y+{by}\nPrize: X={px}, Y={py}"
+        )
+    return "\n\n".join(machines) + "\n"
+
+
+def day14(scale: float, rng: random.Random) -> str:
+    lines = (
+        f"p={rng.randrange(101)},{rng.randrange(103)} "
+        f"v={rng.randint(-99, 99)},{rng.randint(-99, 99)}"
+        for _ in range(int(500 * scale))
+    )
+    return "\n".join(lines) + "\n"
+
+
+def day15(scale: float, rng: random.Random) -> str:
+    n = int(50 * scale)
+    rows = []
+    for y in range(n):
+        row = []
+        for x in range(n):
+            if x in (0, n - 1) or y in (0, n - 1) or rng.random() < 0.05:
+                row.append("#")
+            else:
+                row.append("O" if rng.random() < 0.3 else ".")
+        rows.append(row)
+    rows[n // 2][n // 2] = "@"
+    moves = ["".join(rng.choices("<>^v", k=1000)) for _ in range(int(20 * scale))]
+    return _grid(rows) + "\n" + "\n".join(moves) + "\n"
+
+
+def day16(scale: float, rng: random.Random) -> str:
+    # randomized depth first maze with extra openings, so there are several
+    # equally good paths
+    n = int(141 * scale) | 1
+    rows = [["#"] * n for _ in range(n)]
+    start = (1, n - 2)
+    rows[start[1]][start[0]] = "."
+    stack = [start]
+    while stack:
+        x, y = stack[-1]
+        options = [
+            (x + 2 * dx, y + 2 * dy, dx, dy)
+            for dx, dy in DIRECTIONS
+            if 0 < x + 2 * dx < n - 1
+            and 0 < y + 2 * dy < n - 1
+            and rows[y + 2 * dy][x + 2 * dx] == "#"
+        ]
+        if not options:
+            stack.pop()
+            continue
+        nx, ny, dx, dy = rng.choice(options)
+        rows[y + dy][x + dx] = rows[ny][nx] = "."
+        stack.append((nx, ny))
+    for _ in range(n * n // 50):
+        x, y = rng.randrange(1, n - 1), rng.randrange(1, n - 1)
+        rows[y][x] = "."
+    rows[start[1]][start[0]] = "S"
+    rows[1][n - 2] = "E"
+    return _grid(rows)
+
+
+def day17(scale: float, rng: random.Random) -> str:
+    # day17 part 2 relies on the structure of this program
+    a = rng.getrandbits(int(48 * scale))
+    program = "2,4,1,3,7,5,0,3,1,4,4,7,5,5,3,0"
+    return f"Register A: {a}\nRegister B: 0\nRegister C: 0\n\nProgram: {program}\n"
+
+
+def day18(scale: float, rng: random.Random) -> str:
+    # the memory space is fixed at 71x71, so scale only changes how full it gets
+    cells = [
+        (x, y) for y in range(71) for x in range(71) if (x, y) not in ((0, 0), (70, 70))
+    ]
+    rng.shuffle(cells)
+    n = min(len(cells), int(3450 * scale))
+    return "\n".join(f"{x},{y}" for x, y in cells[:n]) + "\n"
+
+
+def day19(scale: float, rng: random.Random) -> str:
+    colors = "wubrg"
+    # sorted, a set iterates in hash order, which changes with PYTHONHASHSEED
+    patterns = sorted(
+        {"".join(rng.choices(colors, k=rng.randint(1, 8))) for _ in range(450)}
+    )
+    designs = []
+    for _ in range(int(400 * scale)):
+        if rng.random() < 0.7:
+            design = ""
+            while len(design) < rng.randint(20, 60):
+                design += rng.choice(patterns)
+        else:
+            design = "".join(rng.choices(colors, k=rng.randint(20, 60)))
+        designs.append(design)
+    return ", ".join(patterns) + "\n\n" + "\n".join(designs) + "\n"
+
+
+def day21(scale: float, rng: random.Random) -> str:
+    codes = (f"{rng.randint(0, 999):03}A" for _ in range(int(5 * scale)))
+    return "\n".join(codes) + "\n"
+
+
+def day22(scale: float, rng: random.Random) -> str:
+    seeds = (str(rng.randint(1, 2**24 - 1)) for _ in range(int(2000 * scale)))
+    return "\n".join(seeds) + "\n"
+
+
+GENERATORS: dict[str, Callable[[float, random.Random], str]] = {
+    name: func for name, func in globals().items() if name.startswith("day")
+}
+
+
+def generate(day: str, scale: float = 1, seed: int = 0) -> str:
+    return GENERATORS[day](scale, random.Random(f"{day}:{seed}"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a scaled puzzle input")
+    parser.add_argument("day", choices=sorted(GENERATORS))
+    parser.add_argument("-s", "--scale", type=float, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    sys.stdout.write(generate(args.day, args.scale, args.seed))
+
+
+if __name__ == "__main__":
+    main()
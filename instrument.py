@@ -0,0 +1,98 @@
+import atexit
+import contextlib
+import json
+import os
+import sys
+import time
+from collections import Counter
+from typing import Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+# AOC_INSTRUMENT=progress prints a progress line to stderr every PROGRESS_INTERVAL
+# seconds, AOC_INSTRUMENT=json prints the final report to stderr at exit; unset, the
+# helpers below return right away and progress() hands back the iterable untouched
+MODE = os.environ.get("AOC_INSTRUMENT", "")
+ENABLED = MODE in ("progress", "json")
+PROGRESS_INTERVAL = 1.0
+
+counters = Counter()
+# name -> seconds, summed over every time the phase ran
+phases = Counter()
+_started = time.perf_counter()
+
+
+def count(name: str, n: int = 1) -> None:
+    if ENABLED:
+        counters[name] += n
+
+
+@contextlib.contextmanager
+def phase(name: str) -> Iterator[None]:
+    if not ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        phases[name] += time.perf_counter() - start
+
+
+def progress(iterable: Iterable[T], name: str, total: int | None = None) -> Iterable[T]:
+    # counts items into counters[name]; only checks the clock every 64 items
+    if not ENABLED:
+        return iterable
+    return _progress(iterable, name, total)
+
+
+def _progress(iterable: Iterable[T], name: str, total: int | None) -> Iterator[T]:
+    start = last = time.perf_counter()
+    done = 0
+    for done, item in enumerate(iterable, 1):
+        yield item
+        if done % 64 == 0 and MODE == "progress":
+            now = time.perf_counter()
+            if now - last >= PROGRESS_INTERVAL:
+                last = now
+                print(_progress_line(name, done, total, now - start), file=sys.stderr)
+    counters[name] += done
+    phases[name] += time.perf_counter() - start
+
+
+def _progress_line(name: str, done: int, total: int | None, elapsed: float) -> str:
+    of = f"/{total}" if total is not None else ""
+    line = f"{name} {done}{of} {done / elapsed:.0f}/s"
+    others = ", ".join(f"{k} {v}" for k, v in counters.items())
+    return f"{line} ({others})" if others else line
+
+
+def report() -> dict:
+    # rates are per second of the phase with the same name, if there is one, and of
+    # the whole run otherwise; <name>.hits/<name>.misses pairs also get a hit rate
+    elapsed = time.perf_counter() - _started
+    rates = {name: n / (phases.get(name) or elapsed) for name, n in counters.items()}
+    hit_rates = {}
+    for name, hits in counters.items():
+        if name.endswith(".hits"):
+            base = name.removesuffix(".hits")
+            lookups = hits + counters[f"{base}.misses"]
+            hit_rates[base] = hits / lookups if lookups else 0.0
+    return {
+        "elapsed": elapsed,
+        "counters": dict(counters),
+        "rates": rates,
+        "hit_rates": hit_rates,
+        "phases": dict(phases),
+    }
+
+
+def reset() -> None:
+    global _started
+    counters.clear()
+    phases.clear()
+    _started = time.perf_counter()
+
+
+if MODE == "json":
+    atexit.register(lambda: print(json.dumps(report(), indent=4), file=sys.stderr))
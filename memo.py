@@ -0,0 +1,142 @@
+import atexit
+import contextlib
+import functools
+import sys
+from collections import Counter, OrderedDict, defaultdict
+from pathlib import Path
+from typing import Any, Callable, Iterator, Self
+
+import instrument
+
+# name -> hits, misses and evictions summed over every memo with that name, so the
+# numbers outlive memos created per call or per instance
+totals: defaultdict[str, Counter] = defaultdict(Counter)
+
+_MISSING = object()
+
+
+class Memo:
+    # functools.cache with limits: maxsize evicts the least recently used entry past
+    # that many entries, maxbytes past roughly that much memory (keys and values by
+    # sys.getsizeof, not deep sizes). Positional, hashable arguments only.
+    #
+    # store names a pickle under .cache/memo/ that is loaded on creation and written
+    # by save() or scope(), keyed by the function's source; like cached_parse it only
+    # takes effect with AOC_CACHE=1. The source says nothing about the input, so a
+    # function whose results depend on it must put it in the name, e.g.
+    # f"day19-{cache.input_hash(s)[:16]}", and closures and bound methods are refused
+    def __init__(
+        self,
+        func: Callable,
+        maxsize: int | None = None,
+        maxbytes: int | None = None,
+        name: str | None = None,
+        store: str | None = None,
+    ):
+        functools.update_wrapper(self, func)
+        self.func = func
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.name = name or f"{func.__module__}.{func.__qualname__}"
+        self.stats = totals[self.name]
+        self.entries = OrderedDict()
+        self.sizes = {}
+        self.bytes = 0
+        self.path = None
+        if store is not None:
+            if getattr(func, "__closure__", None) or hasattr(func, "__self__"):
+                raise TypeError(f"{self.name}: a stored memo can't depend on state")
+            # cache is imported here, most memos have no store and days import fast
+            import inspect
+
+            import cache
+
+            if cache.enabled():
+                source = cache.source_hash(Path(inspect.getsourcefile(func)))
+                self.path = cache.CACHE_DIR / "memo" / f"{store}-{source[:16]}.pickle"
+                if self.path.exists():
+                    for key, value in cache.load(self.path).items():
+                        self._add(key, value)
+
+    def __call__(self, *args) -> Any:
+        value = self.entries.get(args, _MISSING)
+        if value is not _MISSING:
+            self.stats["hits"] += 1
+            if self.maxsize is not None or self.maxbytes is not None:
+                self.entries.move_to_end(args)
+            return value
+        self.stats["misses"] += 1
+        value = self.func(*args)
+        self._add(args, value)
+        return value
+
+    def _add(self, key: tuple, value: Any) -> None:
+        self.entries[key] = value
+        if self.maxbytes is not None:
+            size = sys.getsizeof(key) + sys.getsizeof(value)
+            self.sizes[key] = size
+            self.bytes += size
+        while (self.maxsize is not None and len(self.entries) > self.maxsize) or (
+            self.maxbytes is not None and self.bytes > self.maxbytes
+        ):
+            old, _ = self.entries.popitem(last=False)
+            self.bytes -= self.sizes.pop(old, 0)
+            self.stats["evictions"] += 1
+
+    def __get__(self, instance: Any, owner: type | None = None) -> Any:
+        # as a class attribute it would key on self and keep every instance alive,
+        # so methods get a memo per instance in __init__ instead
+        if instance is None:
+            return self
+        raise TypeError(f"{self.name}: memoize methods per instance, not per class")
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.sizes.clear()
+        self.bytes = 0
+
+    def save(self) -> None:
+        if self.path is not None:
+            import cache
+
+            cache.dump(self.path, dict(self.entries))
+
+    @contextlib.contextmanager
+    def scope(self) -> Iterator[Self]:
+        # entries live for one call tree, e.g. a single part
+        try:
+            yield self
+        finally:
+            self.save()
+            self.clear()
+
+
+def memoize(
+    maxsize: int | None = None,
+    *,
+    maxbytes: int | None = None,
+    name: str | None = None,
+    store: str | None = None,
+) -> Callable[[Callable], Memo]:
+    def decorator(func: Callable) -> Memo:
+        return Memo(func, maxsize, maxbytes, name, store)
+
+    return decorator
+
+
+def stats() -> dict[str, dict[str, int]]:
+    return {name: dict(counts) for name, counts in totals.items()}
+
+
+def _publish() -> None:
+    for name, counts in totals.items():
+        for kind, n in counts.items():
+            instrument.count(f"{name}.{kind}", n)
+
+
+if instrument.ENABLED:
+    # registered after instrument's own exit hook, so it runs before the report
+    atexit.register(_publish)
@@ -0,0 +1,100 @@
+import linecache
+import threading
+import tracemalloc
+from dataclasses import dataclass, field
+from types import ModuleType
+from typing import Any, Callable
+
+MiB = 1024 * 1024
+# days declare MEMORY_BUDGET in their main.py to tighten or relax this
+DEFAULT_MEMORY_BUDGET = 256 * MiB
+
+
+@dataclass
+class Site:
+    location: str
+    size: int
+    count: int  # allocated blocks, roughly the number of objects
+
+    def __str__(self) -> str:
+        return f"{self.size / MiB:>8.2f}MiB {self.count:>9} blocks  {self.location}"
+
+
+@dataclass
+class MemoryReport:
+    peak: int
+    result: Any = field(repr=False)
+    sites: list[Site] = field(default_factory=list)
+
+    def __str__(self) -> str:
+        lines = [f"peak {self.peak / MiB:.2f}MiB"]
+        lines.extend(f"  {site}" for site in self.sites)
+        return "\n".join(lines)
+
+
+def budget(module: ModuleType) -> int:
+    return getattr(module, "MEMORY_BUDGET", DEFAULT_MEMORY_BUDGET)
+
+
+# a new snapshot is only taken once memory grew this much past the last one, since
+# every snapshot copies all traces
+SNAPSHOT_GROWTH = 0.10
+
+
+class _PeakSampler(threading.Thread):
+    # keeps a snapshot taken close to the highest traced memory seen while polling
+    def __init__(self, interval: float):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.best = -1
+        self.snapshot = None
+
+    def sample(self) -> None:
+        current, _ = tracemalloc.get_traced_memory()
+        if self.snapshot is None or current > self.best * (1 + SNAPSHOT_GROWTH):
+            self.best = current
+            self.snapshot = tracemalloc.take_snapshot()
+
+    def run(self) -> None:
+        while not self.stopped.wait(self.interval):
+            self.sample()
+
+
+def measure(
+    func: Callable, *args, top: int = 10, interval: float = 0.01
+) -> MemoryReport:
+    # peak traced memory of a single call plus the largest allocation sites in
+    # the sampled snapshot closest to that peak
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline, _ = tracemalloc.get_traced_memory()
+    sampler = _PeakSampler(interval)
+    sampler.start()
+    try:
+        result = func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+        sampler.stopped.set()
+        sampler.join()
+        sampler.sample()
+        snapshot = sampler.snapshot.filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, threading.__file__),
+                tracemalloc.Filter(False, __file__),
+            )
+        )
+    finally:
+        sampler.stopped.set()
+        if not was_tracing:
+            tracemalloc.stop()
+
+    sites = []
+    for stat in snapshot.statistics("lineno")[:top]:
+        frame = stat.traceback[0]
+        line = linecache.getline(frame.filename, frame.lineno).strip()
+        location = f"{frame.filename}:{frame.lineno} {line}"
+        sites.append(Site(location, stat.size, stat.count))
+    return MemoryReport(peak - baseline, result, sites)
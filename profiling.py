@@ -0,0 +1,174 @@
+import argparse
+import contextlib
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import sys
+import time
+import types
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable
+
+from bench import ROOT, discover, inputs, parts
+
+PROFILE_DIR = ROOT / ".profile"
+MODES = ("cprofile", "stacks", "counts", "time")
+# modules whose functions are shared by every day
+SHARED = ("util.py", "search.py")
+
+
+def frame_name(filename: str, qualname: str) -> str:
+    path = Path(filename)
+    if path.is_relative_to(ROOT):
+        filename = str(path.relative_to(ROOT))
+    return f"{filename}:{qualname}"
+
+
+class StackProfiler:
+    # self time per full call stack, written in the collapsed format that
+    # flamegraph.pl and speedscope read: "a;b;c <microseconds>"
+    def __init__(self):
+        self.stack = [()]
+        self.totals = Counter()
+        self.last = time.perf_counter_ns()
+
+    def __call__(self, frame, event: str, arg: Any) -> None:
+        now = time.perf_counter_ns()
+        self.totals[self.stack[-1]] += now - self.last
+        if event == "call":
+            code = frame.f_code
+            name = frame_name(code.co_filename, code.co_qualname)
+            self.stack.append((*self.stack[-1], name))
+        elif event == "return" and len(self.stack) > 1:
+            self.stack.pop()
+        self.last = time.perf_counter_ns()
+
+    def collapsed(self) -> str:
+        lines = [
+            f"{';'.join(stack)} {ns // 1000}"
+            for stack, ns in self.totals.most_common()
+            if stack and ns >= 1000
+        ]
+        return "\n".join(lines) + "\n"
+
+
+@functools.cache
+def qualnames(filename: str) -> dict[tuple[int, str], str]:
+    # pstats only keeps co_name, so Grid.get and Overlay.get would differ by line
+    # number alone; compiling the file again recovers co_qualname for every function
+    try:
+        code = compile(Path(filename).read_text(), filename, "exec")
+    except (OSError, SyntaxError, ValueError):
+        return {}
+    names = {}
+    stack = [code]
+    while stack:
+        code = stack.pop()
+        names[code.co_firstlineno, code.co_name] = code.co_qualname
+        stack.extend(c for c in code.co_consts if isinstance(c, types.CodeType))
+    return names
+
+
+def call_counts(stats: pstats.Stats) -> dict[str, int]:
+    # summed, since lambdas and comprehensions share a qualname
+    counts = Counter()
+    for (filename, line, name), (_, ncalls, *_) in stats.stats.items():
+        qualname = qualnames(filename).get((line, name), name)
+        counts[frame_name(filename, qualname)] += ncalls
+    return dict(sorted(counts.items(), key=lambda kv: kv[1], reverse=True))
+
+
+def profile(func: Callable, mode: str, out: Path) -> Callable:
+    # wraps a part function, writing <out>.<ext> files for the chosen mode
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        out.parent.mkdir(parents=True, exist_ok=True)
+        match mode:
+            case "cprofile" | "counts":
+                profiler = cProfile.Profile()
+                result = profiler.runcall(func, *args, **kwargs)
+                stats = pstats.Stats(profiler)
+                if mode == "cprofile":
+                    stats.dump_stats(out.with_suffix(".prof"))
+                    text = io.StringIO()
+                    report = pstats.Stats(profiler, stream=text)
+                    report.sort_stats("cumulative").print_stats(30)
+                    out.with_suffix(".txt").write_text(text.getvalue())
+                counts = call_counts(stats)
+                out.with_suffix(".counts.json").write_text(json.dumps(counts, indent=4))
+            case "stacks":
+                profiler = StackProfiler()
+                sys.setprofile(profiler)
+                try:
+                    result = func(*args, **kwargs)
+                finally:
+                    sys.setprofile(None)
+                out.with_suffix(".collapsed").write_text(profiler.collapsed())
+            case "time":
+                wall, cpu = time.perf_counter(), time.process_time()
+                result = func(*args, **kwargs)
+                wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+                timings = {"wall": wall, "cpu": cpu, "other": max(0.0, wall - cpu)}
+                out.with_suffix(".time.json").write_text(json.dumps(timings, indent=4))
+            case _:
+                raise ValueError(f"Unknown profiling mode: {mode}")
+        return result
+
+    return wrapper
+
+
+def profiled(mode: str = "cprofile") -> Callable[[Callable], Callable]:
+    # decorator form, e.g. @profiled("counts") on a part_1 while investigating
+    def decorator(func: Callable) -> Callable:
+        day = Path(sys.modules[func.__module__].__file__).parent.name
+        return profile(func, mode, PROFILE_DIR / day / func.__name__)
+
+    return decorator
+
+
+def summary(top: int) -> None:
+    # which shared primitives dominate across the calendar
+    totals = Counter()
+    per_day = {}
+    for counts_file in sorted(PROFILE_DIR.glob("day*/*.counts.json")):
+        counts = json.loads(counts_file.read_text())
+        for name, ncalls in counts.items():
+            if name.startswith(SHARED):
+                totals[name] += ncalls
+                per_day.setdefault(name, Counter())[counts_file.parent.name] += ncalls
+    for name, ncalls in totals.most_common(top):
+        days = ", ".join(f"{d} {n}" for d, n in per_day[name].most_common(3))
+        print(f"{name:<40} {ncalls:>12}  ({days})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile day parts")
+    parser.add_argument("days", nargs="*", help="e.g. day06 day16 (default: all)")
+    parser.add_argument("-m", "--mode", choices=MODES, default="cprofile")
+    parser.add_argument("-i", "--input", default="input", help="input file stem")
+    parser.add_argument("--summary", action="store_true", help="aggregate counts")
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.summary:
+        summary(args.top)
+        return
+
+    for day, module in discover(args.days):
+        path = inputs(day).get(args.input)
+        if path is None:
+            continue
+        s = path.read_text()
+        for part, func in parts(day, module):
+            out = PROFILE_DIR / day / part
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                profile(func, args.mode, out)(s)
+            print(f"{day}.{part}: {out.parent}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
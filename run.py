@@ -0,0 +1,212 @@
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import multiprocessing
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from multiprocessing.connection import Connection, wait
+from pathlib import Path
+
+from bench import ROOT, discover, inputs, parts
+from cache import ResultStore
+from profiling import MODES, PROFILE_DIR, profile
+
+HISTORY_FILE = ROOT / ".run_history.json"
+DEFAULT_TIMEOUT = 60.0
+
+
+@dataclass
+class Job:
+    day: str
+    part: str
+    path: Path
+    expected: float = float("inf")  # unknown jobs are assumed to be the slowest
+    status: str = "pending"
+    answer: str = ""
+    elapsed: float = 0.0
+    process: multiprocessing.Process | None = field(default=None, repr=False)
+    conn: Connection | None = field(default=None, repr=False)
+    started: float = 0.0
+    cache_key: str = ""
+
+    @property
+    def key(self) -> str:
+        return f"{self.day}.{self.part}.{self.path.stem}"
+
+
+def execute(
+    day: str, part: str, path: Path, conn: Connection, profile_mode: str | None = None
+) -> None:
+    sys.path.insert(0, str(ROOT))
+    try:
+        func = getattr(importlib.import_module(f"{day}.main"), part)
+        if profile_mode:
+            func = profile(func, profile_mode, PROFILE_DIR / day / part)
+        s = path.read_text()
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            start = time.perf_counter()
+            answer = func(s)
+            elapsed = time.perf_counter() - start
+        if answer is None:
+            # a part that prints its answer instead of returning it
+            answer = stdout.getvalue().strip().replace("\n", "; ")
+        conn.send(("ok", str(answer), elapsed))
+    except Exception as e:
+        conn.send(("error", f"{type(e).__name__}: {e}", 0.0))
+    finally:
+        conn.close()
+
+
+def collect_jobs(days: list[str], selected: set[str], stem: str) -> list[Job]:
+    jobs = []
+    for day, module in discover(days):
+        path = inputs(day).get(stem)
+        if path is None:
+            continue
+        for part, _ in parts(day, module):
+            if part in selected:
+                jobs.append(Job(day, part, path))
+    return jobs
+
+
+def load_history() -> dict[str, float]:
+    if not HISTORY_FILE.exists():
+        return {}
+    return json.loads(HISTORY_FILE.read_text())
+
+
+def save_history(jobs: list[Job]) -> None:
+    history = load_history()
+    history.update({job.key: job.elapsed for job in jobs if job.status == "ok"})
+    HISTORY_FILE.write_text(json.dumps(history, indent=4, sort_keys=True))
+
+
+def schedule(
+    jobs: list[Job], workers: int, timeout: float, profile_mode: str | None = None
+) -> None:
+    # longest expected job first, so the tail of the run is made of short jobs
+    pending = sorted(jobs, key=lambda job: job.expected, reverse=True)
+    running: list[Job] = []
+    while pending or running:
+        while pending and len(running) < workers:
+            job = pending.pop(0)
+            job.conn, child_conn = multiprocessing.Pipe(duplex=False)
+            job.process = multiprocessing.Process(
+                target=execute,
+                args=(job.day, job.part, job.path, child_conn, profile_mode),
+            )
+            job.started = time.perf_counter()
+            job.process.start()
+            child_conn.close()
+            job.status = "running"
+            running.append(job)
+
+        now = time.perf_counter()
+        next_deadline = min(job.started + timeout for job in running)
+        ready = wait([job.conn for job in running], max(0.0, next_deadline - now))
+
+        now = time.perf_counter()
+        for job in list(running):
+            if job.conn in ready:
+                try:
+                    job.status, job.answer, job.elapsed = job.conn.recv()
+                except EOFError:
+                    job.process.join()
+                    job.status = "crashed"
+                    job.answer = f"exit code {job.process.exitcode}"
+                    job.elapsed = now - job.started
+            elif now - job.started >= timeout:
+                job.process.terminate()
+                job.status, job.elapsed = "timeout", now - job.started
+            else:
+                continue
+            job.process.join()
+            job.conn.close()
+            running.remove(job)
+
+
+def use_cache(jobs: list[Job], store: ResultStore, verify: bool) -> list[Job]:
+    # returns jobs that still have to run; with verify everything runs again
+    to_run = []
+    for job in jobs:
+        job.cache_key = store.key(job.day, job.part, job.path)
+        entry = store.get(job.cache_key)
+        if entry is None or verify:
+            to_run.append(job)
+        else:
+            # keeps the runtime of the run that produced the answer
+            job.status, job.answer, job.elapsed = (
+                "cached",
+                entry["answer"],
+                entry["elapsed"],
+            )
+    return to_run
+
+
+def store_results(jobs: list[Job], store: ResultStore, verify: bool) -> None:
+    for job in jobs:
+        if job.status != "ok":
+            continue
+        entry = store.get(job.cache_key)
+        if verify and entry is not None and entry["answer"] != job.answer:
+            job.status = "mismatch"
+            job.answer += f" (cached: {entry['answer']})"
+            continue
+        store.put(job.cache_key, job.day, job.part, job.answer, job.elapsed)
+    store.save()
+
+
+def print_summary(jobs: list[Job], wall: float) -> None:
+    print(f"{'job':<24} {'status':<8} {'time':>10}  answer")
+    for job in sorted(jobs, key=lambda job: job.key):
+        print(f"{job.key:<24} {job.status:<8} {job.elapsed:>9.3f}s  {job.answer}")
+    total = sum(job.elapsed for job in jobs if job.status != "cached")
+    print(f"\nWall time: {wall:.3f}s (sequential: {total:.3f}s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run days in parallel")
+    parser.add_argument("days", nargs="*", help="e.g. day06 day16 (default: all)")
+    parser.add_argument(
+        "-p", "--parts", nargs="+", choices=("1", "2"), default=("1", "2")
+    )
+    parser.add_argument("-i", "--input", default="input", help="input file stem")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count())
+    parser.add_argument("-t", "--timeout", type=float, default=DEFAULT_TIMEOUT)
+    parser.add_argument("--profile", choices=MODES, help="profile every job")
+    parser.add_argument("--no-cache", action="store_true", help="ignore stored answers")
+    parser.add_argument(
+        "--verify", action="store_true", help="recompute and check stored answers"
+    )
+    args = parser.parse_args()
+
+    selected = {f"part_{p}" for p in args.parts}
+    jobs = collect_jobs(args.days, selected, args.input)
+    history = load_history()
+    for job in jobs:
+        job.expected = history.get(job.key, job.expected)
+
+    store = ResultStore()
+    # profiling needs the parts to actually run
+    skip_cache = args.no_cache or args.profile
+    to_run = jobs if skip_cache else use_cache(jobs, store, args.verify)
+
+    start = time.perf_counter()
+    schedule(to_run, args.jobs, args.timeout, args.profile)
+    wall = time.perf_counter() - start
+
+    save_history(to_run)
+    if not skip_cache:
+        store_results(to_run, store, args.verify)
+    print_summary(jobs, wall)
+    if any(job.status not in ("ok", "cached") for job in jobs):
+        exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+import heapq
+from collections import defaultdict, deque
+from itertools import count
+from typing import Callable, Hashable, Iterable, Iterator, TypeVar
+
+import instrument
+from util import Vec
+
+T = TypeVar("T", bound=Hashable)
+
+# neighbours(node) -> nodes for unweighted searches, (node, cost) pairs otherwise
+Neighbours = Callable[[T], Iterable[T]]
+WeightedNeighbours = Callable[[T], Iterable[tuple[T, int]]]
+
+
+def bfs(
+    start: T, neighbours: Neighbours, end: T | None = None
+) -> tuple[dict[T, int], dict[T, list[T]]]:
+    # unit weights: returns distances and every equally short predecessor
+    distances = {start: 0}
+    prev = defaultdict(list)
+    q = deque([start])
+    while q:
+        node = q.popleft()
+        if node == end:
+            break
+        new_distance = distances[node] + 1
+        for neighbour in neighbours(node):
+            old_distance = distances.get(neighbour)
+            if old_distance is None:
+                distances[neighbour] = new_distance
+                prev[neighbour].append(node)
+                q.append(neighbour)
+            elif old_distance == new_distance:
+                prev[neighbour].append(node)
+    instrument.count("search.bfs.nodes", len(distances))
+    return distances, prev
+
+
+def dijkstra(
+    start: T, neighbours: WeightedNeighbours, end: T | None = None
+) -> tuple[dict[T, int], dict[T, list[T]]]:
+    distances = {start: 0}
+    prev = defaultdict(list)
+    visited = set()
+    # the counter breaks ties so nodes never have to be comparable
+    tie = count()
+    q = [(0, next(tie), start)]
+    while q:
+        distance, _, node = heapq.heappop(q)
+        if node in visited:
+            continue
+        visited.add(node)
+        if node == end:
+            break
+        for neighbour, cost in neighbours(node):
+            if neighbour in visited:
+                continue
+            new_distance = distance + cost
+            old_distance = distances.get(neighbour)
+            if old_distance is None or new_distance < old_distance:
+                distances[neighbour] = new_distance
+                prev[neighbour] = [node]
+                heapq.heappush(q, (new_distance, next(tie), neighbour))
+            elif new_distance == old_distance:
+                prev[neighbour].append(node)
+    instrument.count("search.dijkstra.nodes", len(visited))
+    return distances, prev
+
+
+def dial(
+    start: T, neighbours: WeightedNeighbours, max_cost: int, end: T | None = None
+) -> tuple[dict[T, int], dict[T, list[T]]]:
+    # Dijkstra over a circular bucket queue, for small non-negative integer costs;
+    # pending distances always fit in a window of max_cost + 1 buckets
+    distances = {start: 0}
+    prev = defaultdict(list)
+    visited = set()
+    size = max_cost + 1
+    buckets = [[] for _ in range(size)]
+    buckets[0].append(start)
+    pending = 1
+    distance = 0
+    while pending:
+        bucket = buckets[distance % size]
+        while bucket:
+            node = bucket.pop()
+            pending -= 1
+            if node in visited or distances[node] != distance:
+                continue
+            visited.add(node)
+            if node == end:
+                instrument.count("search.dial.nodes", len(visited))
+                return distances, prev
+            for neighbour, cost in neighbours(node):
+                if neighbour in visited:
+                    continue
+                new_distance = distance + cost
+                old_distance = distances.get(neighbour)
+                if old_distance is None or new_distance < old_distance:
+                    distances[neighbour] = new_distance
+                    prev[neighbour] = [node]
+                    buckets[new_distance % size].append(neighbour)
+                    pending += 1
+                elif new_distance == old_distance:
+                    prev[neighbour].append(node)
+        distance += 1
+    instrument.count("search.dial.nodes", len(visited))
+    return distances, prev
+
+
+def manhattan(a: Vec, b: Vec) -> int:
+    return abs(a.x - b.x) + abs(a.y - b.y)
+
+
+def astar(
+    start: T,
+    end: T,
+    neighbours: WeightedNeighbours,
+    heuristic: Callable[[T, T], int] = manhattan,
+) -> float:
+    # returns the cost of the cheapest path, inf when end is unreachable
+    distances = {start: 0}
+    tie = count()
+    q = [(heuristic(start, end), next(tie), 0, start)]
+    while q:
+        _, _, distance, node = heapq.heappop(q)
+        if node == end:
+            instrument.count("search.astar.nodes", len(distances))
+            return distance
+        if distance > distances[node]:
+            continue
+        for neighbour, cost in neighbours(node):
+            new_distance = distance + cost
+            if new_distance < distances.get(neighbour, float("inf")):
+                distances[neighbour] = new_distance
+                priority = new_distance + heuristic(neighbour, end)
+                heapq.heappush(q, (priority, next(tie), new_distance, neighbour))
+    instrument.count("search.astar.nodes", len(distances))
+    return float("inf")
+
+
+def shortest_path_nodes(prev: dict[T, list[T]], ends: Iterable[T]) -> set[T]:
+    # every node that lies on at least one shortest path to any of ends
+    nodes = set(ends)
+    q = list(nodes)
+    while q:
+        node = q.pop()
+        for p in prev.get(node, ()):
+            if p not in nodes:
+                nodes.add(p)
+                q.append(p)
+    return nodes
+
+
+def shortest_paths(prev: dict[T, list[T]], start: T, end: T) -> Iterator[list[T]]:
+    # walks the predecessor DAG back from end, yielding each path start -> end
+    q = [(end, [end])]
+    while q:
+        node, path = q.pop()
+        if node == start:
+            yield path[::-1]
+            continue
+        for p in prev.get(node, ()):
+            q.append((p, [*path, p]))
@@ -0,0 +1,19 @@
+from abc import ABC, abstractmethod
+from typing import Any
+
+
+class Session(ABC):
+    # one puzzle input shared by both parts: days subclass this and keep the parse
+    # and any shared intermediate results in functools.cached_property, so asking
+    # for both answers does the common work once; part_1(s)/part_2(s) wrap it
+    def __init__(self, s: Any):
+        self.s = s
+
+    @abstractmethod
+    def part_1(self) -> Any: ...
+
+    @abstractmethod
+    def part_2(self) -> Any: ...
+
+    def solve(self) -> tuple[Any, Any]:
+        return self.part_1(), self.part_2()
@@ -0,0 +1,54 @@
+import io
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, TextIO, TypeVar
+
+T = TypeVar("T")
+
+# puzzle text, a file to read lazily, or an open stream such as sys.stdin
+Source = str | Path | TextIO
+
+BATCH_SIZE = 4096
+
+
+def lines(source: Source) -> Iterator[str]:
+    # one line at a time without the newline, never the whole input as a list
+    if isinstance(source, Path):
+        with source.open() as f:
+            yield from lines(f)
+        return
+    if isinstance(source, str):
+        source = io.StringIO(source)
+    for line in source:
+        yield line.rstrip("\n")
+
+
+def batched(iterable: Iterable[T], size: int) -> Iterator[list[T]]:
+    it = iter(iterable)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+def batches(source: Source, size: int = BATCH_SIZE) -> Iterator[list[str]]:
+    return batched(filter(None, lines(source)), size)
+
+
+def records(
+    source: Source, parse: Callable[[str], T], size: int = BATCH_SIZE
+) -> Iterator[T]:
+    # parses non-empty lines a batch at a time, keeping memory at one batch
+    for batch in batches(source, size):
+        yield from map(parse, batch)
+
+
+def blocks(source: Source) -> Iterator[list[str]]:
+    # groups of lines separated by blank lines
+    block = []
+    for line in lines(source):
+        if line:
+            block.append(line)
+        elif block:
+            yield block
+            block = []
+    if block:
+        yield block
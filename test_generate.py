@@ -0,0 +1,27 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from generate import GENERATORS
+
+ROOT = Path(__file__).parent
+
+
+def generate_in_process(day: str, hash_seed: str) -> bytes:
+    # a fresh interpreter, so hash ordering differs like between bench runs
+    env = dict(os.environ, PYTHONHASHSEED=hash_seed)
+    return subprocess.run(
+        [sys.executable, "generate.py", day, "--scale", "0.3", "--seed", "1"],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        check=True,
+    ).stdout
+
+
+@pytest.mark.parametrize("day", sorted(GENERATORS))
+def test_deterministic(day):
+    assert generate_in_process(day, "1") == generate_in_process(day, "2")
@@ -0,0 +1,97 @@
+import sys
+
+import pytest
+
+import cache
+from memo import Memo, memoize, totals
+
+
+def square(x: int) -> int:
+    return x * x
+
+
+@pytest.fixture(autouse=True)
+def clear_totals():
+    yield
+    totals.clear()
+
+
+def test_hits_and_misses():
+    memo = Memo(square, name="test.counts")
+    assert [memo(2), memo(2), memo(3)] == [4, 4, 9]
+    assert totals["test.counts"] == {"hits": 1, "misses": 2}
+
+
+def test_maxsize_evicts_least_recently_used():
+    memo = Memo(square, maxsize=2, name="test.lru")
+    memo(1)
+    memo(2)
+    memo(1)  # 2 is now the oldest
+    memo(3)
+    assert list(memo.entries) == [(1,), (3,)]
+    assert totals["test.lru"]["evictions"] == 1
+
+
+def test_maxbytes_evicts_past_the_limit():
+    size = sys.getsizeof((0,)) + sys.getsizeof(0)
+    memo = Memo(square, maxbytes=2 * size, name="test.bytes")
+    for x in range(1, 5):
+        memo(x)
+    assert len(memo) == 2
+    assert list(memo.entries) == [(3,), (4,)]
+    assert memo.bytes <= 2 * size
+    assert totals["test.bytes"]["evictions"] == 2
+
+
+def test_scope_clears_on_exit():
+    memo = Memo(square)
+    with memo.scope() as scoped:
+        scoped(4)
+        assert len(memo) == 1
+    assert len(memo) == 0 and memo.bytes == 0
+
+
+def test_store_round_trip(monkeypatch, tmp_path):
+    monkeypatch.setenv("AOC_CACHE", "1")
+    monkeypatch.setattr(cache, "CACHE_DIR", tmp_path)
+    with Memo(square, store="test").scope() as memo:
+        memo(5)
+    assert memo.path.exists()
+
+    calls = []
+    reloaded = Memo(square, store="test", name="test.reloaded")
+    reloaded.func = lambda x: calls.append(x)
+    assert reloaded(5) == 25
+    assert calls == []
+    assert totals["test.reloaded"] == {"hits": 1}
+
+
+def test_store_is_off_without_aoc_cache(monkeypatch, tmp_path):
+    monkeypatch.delenv("AOC_CACHE", raising=False)
+    monkeypatch.setattr(cache, "CACHE_DIR", tmp_path)
+    memo = Memo(square, store="test")
+    memo(5)
+    memo.save()
+    assert memo.path is None
+    assert list(tmp_path.iterdir()) == []
+
+
+class Shift:
+    def __init__(self, offset: int):
+        self.offset = offset
+
+    def apply(self, x: int) -> int:
+        return x + self.offset
+
+
+def test_store_refuses_state():
+    # the stored results would be reused for any other offset
+    offset = 1
+
+    def shifted(x: int) -> int:
+        return x + offset
+
+    with pytest.raises(TypeError):
+        memoize(store="test")(shifted)
+    with pytest.raises(TypeError):
+        Memo(Shift(1).apply, store="test")
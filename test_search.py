@@ -0,0 +1,89 @@
+import random
+
+import pytest
+
+from search import astar, bfs, dial, dijkstra
+from util import Vec
+
+MAX_COST = 5
+
+
+def random_graph(seed: int, unit: bool = False) -> dict[int, dict[int, int]]:
+    rng = random.Random(seed)
+    n = rng.randint(2, 12)
+    edges = {node: {} for node in range(n)}
+    for a in range(n):
+        for b in rng.sample(range(n), rng.randint(0, min(4, n))):
+            if a != b:
+                edges[a][b] = 1 if unit else rng.randint(1, MAX_COST)
+    return edges
+
+
+def reference(edges: dict[int, dict[int, int]], start: int):
+    # Bellman-Ford, then every predecessor on a shortest path
+    distances = {start: 0}
+    for _ in edges:
+        for a, out in edges.items():
+            for b, cost in out.items():
+                if a in distances and distances[a] + cost < distances.get(b, 1e9):
+                    distances[b] = distances[a] + cost
+    prev = {
+        b: sorted(a for a in distances if distances[a] + edges[a].get(b, 1e9) == d)
+        for b, d in distances.items()
+        if b != start
+    }
+    return distances, prev
+
+
+def normalized(prev) -> dict:
+    return {node: sorted(p) for node, p in prev.items() if p}
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_weighted_searches_match_reference(seed):
+    edges = random_graph(seed)
+    neighbours = lambda node: edges[node].items()
+    expected = reference(edges, 0)
+    for distances, prev in (
+        dijkstra(0, neighbours),
+        dial(0, neighbours, MAX_COST),
+    ):
+        assert distances == expected[0]
+        assert normalized(prev) == expected[1]
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_bfs_matches_reference(seed):
+    edges = random_graph(seed, unit=True)
+    distances, prev = bfs(0, lambda node: edges[node])
+    expected = reference(edges, 0)
+    assert distances == expected[0]
+    assert normalized(prev) == expected[1]
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_astar_matches_reference(seed):
+    # non-Vec states with a zero heuristic
+    edges = random_graph(seed)
+    distances, _ = reference(edges, 0)
+    for end in edges:
+        cost = astar(0, end, lambda node: edges[node].items(), lambda a, b: 0)
+        assert cost == distances.get(end, float("inf"))
+
+
+def test_astar_on_grid():
+    walls = {Vec(1, 0), Vec(1, 1)}
+    neighbours = lambda pos: (
+        (n, 1)
+        for n in pos.neighbours()
+        if 0 <= n.x < 3 and 0 <= n.y < 3 and n not in walls
+    )
+    assert astar(Vec(0, 0), Vec(2, 0), neighbours) == 6
+
+
+def test_dial_wraps_bucket_window():
+    # distances run far past max_cost + 1, so buckets are reused many times
+    edges = {i: {i + 1: 3, i + 2: 5} for i in range(40)}
+    edges |= {40: {}, 41: {}}
+    neighbours = lambda node: edges[node].items()
+    assert dial(0, neighbours, 5)[0] == reference(edges, 0)[0]
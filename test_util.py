@@ -0,0 +1,123 @@
+import pytest
+
+from util import OUTSIDE, Grid, Overlay, Vec, iter_lines
+
+
+@pytest.fixture
+def grid():
+    return Grid.from_string("ab\ncd\n")
+
+
+def test_unchecked_index_wraps_rows(grid):
+    # documented contract: the hot path does not check x
+    assert grid[Vec(2, 0)] == "c"
+    assert grid[Vec(-1, 1)] == "b"
+    with pytest.raises(IndexError):
+        grid[Vec(0, 2)]
+
+
+def test_checked_access(grid):
+    assert grid.get(Vec(2, 0)) is None
+    assert grid.get(Vec(-1, 1), "#") == "#"
+    assert grid.oob(Vec(2, 0))
+    assert not grid.oob(Vec(1, 1))
+
+
+def test_padded_border():
+    grid = Grid.from_string("ab\ncd\n", padded=True)
+    assert grid[Vec(2, 0)] is OUTSIDE
+    assert grid[Vec(-1, -1)] is OUTSIDE
+    assert grid[Vec(1, 1)] == "d"
+    assert list(grid) == [["a", "b"], ["c", "d"]]
+
+
+def test_buffer_view_skips_line_endings():
+    for text in (b"ab\ncd\n", b"ab\ncd", b"ab\r\ncd\r\n", b"ab\r\ncd"):
+        grid = Grid.from_buffer(text)
+        assert (grid.width, grid.height) == (2, 2)
+        assert list(grid) == [["a", "b"], ["c", "d"]]
+        assert grid[Vec(1, 1)] == "d"
+        assert list(grid.find_iter("\r")) == []
+        assert list(grid.find_iter("\n")) == []
+
+
+def test_buffer_view_copies_read_only_memory_on_write():
+    text = b"ab\ncd\n"
+    grid = Grid.from_buffer(text)
+    grid[Vec(0, 1)] = "x"
+    grid.set_at(grid.index(Vec(1, 0)), "y")
+    assert str(grid) == "ay\nxd"
+    assert text == b"ab\ncd\n"
+    assert grid.find("x") == Vec(0, 1)
+
+
+def test_file_view_never_writes_the_file(tmp_path):
+    path = tmp_path / "grid.txt"
+    path.write_text("ab\ncd\n")
+    grid = Grid.from_file(path).build_index()
+    grid[Vec(1, 1)] = "a"
+    assert grid.counts() == {"a": 2, "b": 1, "c": 1}
+    assert path.read_text() == "ab\ncd\n"
+
+
+def test_iter_lines():
+    lines = [bytes(line) for line in iter_lines(b"1,2\r\n3,4\n\n5,6")]
+    assert lines == [b"1,2", b"3,4", b"", b"5,6"]
+
+
+def test_overlay_reads_through_until_written(grid):
+    overlay = Overlay(grid)
+    overlay[Vec(0, 0)] = "x"
+    assert (overlay[Vec(0, 0)], overlay[Vec(1, 0)]) == ("x", "b")
+    assert grid[Vec(0, 0)] == "a"
+    assert list(overlay) == [["x", "b"], ["c", "d"]]
+    assert list(grid) == [["a", "b"], ["c", "d"]]
+
+
+def test_overlay_nested_snapshots(grid):
+    overlay = Overlay(grid)
+    overlay[Vec(0, 0)] = "x"
+    outer = overlay.snapshot()
+    overlay[Vec(1, 0)] = "y"
+    inner = overlay.snapshot()
+    overlay[Vec(0, 1)] = "z"
+    overlay.rollback(inner)
+    assert str(overlay) == "xy\ncd"
+    overlay.rollback(outer)
+    assert str(overlay) == "xb\ncd"
+    overlay.rollback()
+    assert str(overlay) == "ab\ncd"
+    assert overlay.changes == {}
+
+
+def test_overlay_rollback_of_a_cell_written_twice(grid):
+    overlay = Overlay(grid)
+    overlay[Vec(1, 1)] = "x"
+    snapshot = overlay.snapshot()
+    overlay[Vec(1, 1)] = "y"
+    overlay[Vec(1, 1)] = "z"
+    overlay.rollback(snapshot)
+    assert overlay[Vec(1, 1)] == "x"
+    overlay.rollback()
+    assert overlay[Vec(1, 1)] == "d"
+
+
+def test_overlay_find_iter_merges_base_and_changes(grid):
+    overlay = Overlay(grid.build_index())
+    overlay[Vec(0, 0)] = "d"
+    overlay[Vec(1, 1)] = "a"
+    assert sorted(overlay.find_iter("d")) == [Vec(0, 0)]
+    assert sorted(overlay.find_iter("a")) == [Vec(1, 1)]
+    assert overlay.find("b") == Vec(1, 0)
+
+
+def test_overlay_commit_updates_an_indexed_base(grid):
+    grid.build_index()
+    overlay = Overlay(grid)
+    overlay[Vec(0, 0)] = "b"
+    overlay[Vec(0, 0)] = "c"
+    overlay.commit()
+    assert overlay.changes == {} and overlay.snapshot() == 0
+    assert str(grid) == "cb\ncd"
+    assert grid.counts() == {"b": 1, "c": 2, "d": 1}
+    assert sorted(grid.find_iter("c")) == [Vec(0, 0), Vec(0, 1)]
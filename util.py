@@ -1,68 +1,244 @@
 import math
-from dataclasses import dataclass
+import mmap
+from array import array
 from itertools import chain
-from typing import Self, Any, Iterator
+from pathlib import Path
+from typing import Self, Any, Iterator, NamedTuple
 
 
-@dataclass(frozen=True)
-class Vec:
+_new_tuple = tuple.__new__
+
+# counterclockwise (cos, sin) for right angles, so rotations never touch floats
+_ROTATIONS = {0: (1, 0), 90: (0, 1), 180: (-1, 0), 270: (0, -1)}
+
+
+class Vec(NamedTuple):
+    # tuple-backed so hashing, equality and ordering run in C; arithmetic builds
+    # results with tuple.__new__ to skip the generated __new__
     x: int
     y: int
 
     def __add__(self, other: Self) -> Self:
-        return Vec(self.x + other.x, self.y + other.y)
+        return _new_tuple(Vec, (self[0] + other[0], self[1] + other[1]))
 
     def __sub__(self, other: Self) -> Self:
-        return Vec(self.x - other.x, self.y - other.y)
+        return _new_tuple(Vec, (self[0] - other[0], self[1] - other[1]))
 
     def __neg__(self) -> Self:
-        return Vec(-self.x, -self.y)
+        return _new_tuple(Vec, (-self[0], -self[1]))
 
     def rot(self, degrees: int) -> Self:
         # counterclockwise
-        return Vec(
-            x=int(
-                math.cos(math.radians(degrees)) * self.x
-                - math.sin(math.radians(degrees)) * self.y
-            ),
-            y=int(
-                math.sin(math.radians(degrees)) * self.x
-                + math.cos(math.radians(degrees)) * self.y
-            ),
-        )
+        try:
+            cos, sin = _ROTATIONS[degrees % 360]
+        except KeyError:
+            cos, sin = math.cos(math.radians(degrees)), math.sin(math.radians(degrees))
+        x, y = self
+        return _new_tuple(Vec, (int(cos * x - sin * y), int(sin * x + cos * y)))
+
+    def neighbours(self) -> list[Self]:
+        x, y = self
+        return [_new_tuple(Vec, (x + dx, y + dy)) for dx, dy in DIRECTIONS]
+
+    def neighbours8(self) -> list[Self]:
+        x, y = self
+        return [_new_tuple(Vec, (x + dx, y + dy)) for dx, dy in DIRECTIONS_8]
+
+
+DIRECTIONS = (Vec(0, 1), Vec(0, -1), Vec(1, 0), Vec(-1, 0))
+# counterclockwise from east, so DIRECTIONS_8[(i + 2 * k) % 8] is a k * 90 turn
+DIRECTIONS_8 = (
+    Vec(1, 0),
+    Vec(1, 1),
+    Vec(0, 1),
+    Vec(-1, 1),
+    Vec(-1, 0),
+    Vec(-1, -1),
+    Vec(0, -1),
+    Vec(1, -1),
+)
+# ROTATED[direction][degrees] for every direction and right angle
+ROTATED = {d: {deg: d.rot(deg) for deg in _ROTATIONS} for d in DIRECTIONS_8}
+
+
+class _Outside:
+    # a singleton, so copies and pickles of a grid still compare with `is`
+    def __repr__(self) -> str:
+        return "OUTSIDE"
+
+    def __reduce__(self) -> str:
+        return "OUTSIDE"
+
+
+# default border value of padded grids
+OUTSIDE = _Outside()
 
 
 class Grid:
-    def __init__(self, grid: list[list]):
-        self.grid = grid
-        self.height = len(self.grid)
-        self.width = len(self.grid[0])
-        assert all(len(row) == self.width for row in self.grid), "Malformed grid"
+    # cells are stored row-major in a flat array of palette codes; every distinct
+    # value gets a code on first use, so a grid of single characters or enums costs
+    # one byte per cell instead of a pointer per cell plus a list per row
+    #
+    # grid[pos] does no bounds checks: on an unpadded grid x == width or x < 0 reads
+    # the neighbouring row and only y past the last row raises IndexError, so code
+    # that can step outside uses get(), checks oob() first or builds a padded grid
+
+    # code -> {cell index: None} once build_index() was called, kept current by
+    # writes; dicts rather than sets so positions come out in a stable order
+    positions: dict[int, dict[int, None]] | None = None
+
+    # padded grids surround the cells with a one cell border of `border`, so a
+    # single step outside still reads a value and neighbour loops need no oob()
+    def __init__(self, grid: list[list], padded: bool = False, border: Any = OUTSIDE):
+        self.height = len(grid)
+        self.width = len(grid[0])
+        assert all(len(row) == self.width for row in grid), "Malformed grid"
+        pad = int(padded)
+        # distance between rows in data, wider than width for padding or views
+        self.stride = self.width + 2 * pad
+        # position of (0, 0) in data
+        self.offset = pad * self.stride + pad
+        self.palette = []
+        self.codes = {}
+        self.data = array("B")
+        fill = self.encode(border) if padded else 0
+        rows = [[self.encode(value) for value in row] for row in grid]
+        typecode = self.data.typecode
+        self.data = array(typecode, [fill]) * (self.stride * (self.height + 2 * pad))
+        for y, row in enumerate(rows):
+            start = self.offset + y * self.stride
+            self.data[start : start + self.width] = array(typecode, row)
 
     @classmethod
-    def from_string(cls, s: str) -> Self:
-        return cls([list(line) for line in s.splitlines()])
+    def from_string(cls, s: str, padded: bool = False, border: Any = OUTSIDE) -> Self:
+        return cls([list(line) for line in s.splitlines()], padded, border)
 
-    def get(self, item: Vec, default: Any = None) -> Any:
+    @classmethod
+    def from_buffer(cls, buf: bytes | mmap.mmap) -> Self:
+        # zero-copy view over text: cells are the raw bytes, the line ending of
+        # every row (\n or \r\n) is skipped via the stride; read-only buffers such
+        # as bytes are copied on the first write. Subclasses that do their own work
+        # in __init__ have to use from_string instead
+        end = buf.find(b"\n")
+        end = len(buf) if end == -1 else end + 1
+        width = end
+        while width and buf[width - 1] in b"\r\n":
+            width -= 1
+        grid = cls.__new__(cls)
+        grid.width = width
+        grid.stride = end
+        grid.offset = 0
+        # the last line may lack its line ending
+        grid.height = (len(buf) + end - width) // end
+        grid.palette = [chr(i) for i in range(256)]
+        grid.codes = {ch: i for i, ch in enumerate(grid.palette)}
+        grid.data = memoryview(buf)
+        return grid
+
+    @classmethod
+    def from_file(cls, path: Path) -> Self:
+        return cls.from_buffer(map_file(path))
+
+    def encode(self, value: Any) -> int:
+        try:
+            return self.codes[value]
+        except KeyError:
+            pass
+        code = len(self.palette)
+        if code == 256:
+            # more distinct values than a byte can hold, e.g. region ids
+            self.data = array("I", self.data)
+        self.palette.append(value)
+        self.codes[value] = code
+        return code
+
+    def build_index(self) -> Self:
+        # one pass over the cells, after which find is O(1) and find_iter O(k)
+        positions = {}
+        data, width, stride = self.data, self.width, self.stride
+        for start in range(self.offset, self.offset + self.height * stride, stride):
+            for i, code in enumerate(data[start : start + width], start):
+                positions.setdefault(code, {})[i] = None
+        self.positions = positions
+        return self
+
+    def _reindex(self, index: int, code: int) -> None:
+        old = self.data[index]
+        if old != code:
+            if cells := self.positions.get(old):
+                cells.pop(index, None)
+            self.positions.setdefault(code, {})[index] = None
+
+    def counts(self) -> dict[Any, int]:
+        if self.positions is None:
+            self.build_index()
+        return {
+            self.palette[code]: len(cells)
+            for code, cells in self.positions.items()
+            if cells
+        }
+
+    def index(self, pos: Vec) -> int:
+        return pos.y * self.stride + pos.x + self.offset
+
+    def pos(self, index: int) -> Vec:
+        y, x = divmod(index - self.offset, self.stride)
+        return Vec(x, y)
+
+    def at(self, index: int) -> Any:
+        return self.palette[self.data[index]]
+
+    def set_at(self, index: int, value: Any) -> None:
+        code = self.encode(value)
+        if self.positions is not None:
+            self._reindex(index, code)
         try:
-            return self.grid[item.y][item.x]
-        except IndexError:
+            self.data[index] = code
+        except TypeError:
+            self._writable()[index] = code
+
+    def _writable(self) -> memoryview:
+        # first write to a view over read-only memory, e.g. bytes
+        self.data = memoryview(bytearray(self.data))
+        return self.data
+
+    def get(self, item: Vec, default: Any = None) -> Any:
+        if not (0 <= item.x < self.width and 0 <= item.y < self.height):
             return default
+        return self.palette[self.data[item.y * self.stride + item.x + self.offset]]
+
+    def _find_code(self, code: int, start: int = 0) -> int:
+        data = self.data
+        if isinstance(data, memoryview):
+            # views are backed by bytes or mmap, both of which can search in C
+            return data.obj.find(bytes((code,)), start)
+        try:
+            return data.index(code, start)
+        except ValueError:
+            return -1
 
     def find(self, value: Any) -> Vec | None:
-        for y, row in enumerate(self):
-            try:
-                x = row.index(value)
-            except ValueError:
-                continue
-            return Vec(x, y)
-        return None
+        code = self.codes.get(value)
+        if self.positions is not None and code is not None:
+            cells = self.positions.get(code)
+            return self.pos(next(iter(cells))) if cells else None
+        return next(self.find_iter(value), None)
 
     def find_iter(self, value: Any) -> Iterator[Vec]:
-        for y, row in enumerate(self):
-            for x, val in enumerate(row):
-                if val == value:
-                    yield Vec(x, y)
+        code = self.codes.get(value)
+        if code is None:
+            return
+        if self.positions is not None:
+            # copied, so callers may write to the grid while iterating
+            yield from map(self.pos, list(self.positions.get(code, ())))
+            return
+        i = self._find_code(code)
+        while i != -1:
+            pos = self.pos(i)
+            # skips matches in the border or in the newlines of a view
+            if pos.x < self.width and 0 <= pos.y < self.height:
+                yield pos
+            i = self._find_code(code, i + 1)
 
     def items(self) -> Iterator[tuple[Vec, Any]]:
         for y, row in enumerate(self):
@@ -73,10 +249,17 @@ class Grid:
         return not (0 <= pos.x < self.width and 0 <= pos.y < self.height)
 
     def __getitem__(self, item: Vec) -> Any:
-        return self.grid[item.y][item.x]
+        return self.palette[self.data[item.y * self.stride + item.x + self.offset]]
 
     def __setitem__(self, item: Vec, value: Any) -> None:
-        self.grid[item.y][item.x] = value
+        i = item.y * self.stride + item.x + self.offset
+        code = self.encode(value)
+        if self.positions is not None:
+            self._reindex(i, code)
+        try:
+            self.data[i] = code
+        except TypeError:
+            self._writable()[i] = code
 
     def __repr__(self):
         return f"Grid(height={self.height}, width={self.width})"
@@ -88,10 +271,125 @@ class Grid:
         return "\n".join(s)
 
     def __iter__(self) -> Iterator[list]:
-        yield from self.grid
+        palette, data, width, stride = self.palette, self.data, self.width, self.stride
+        for start in range(self.offset, self.offset + self.height * stride, stride):
+            yield [palette[code] for code in data[start : start + width]]
 
     def __len__(self) -> int:
-        return len(self.grid)
+        return self.height
+
+
+_MISSING = object()
+
+
+class Overlay:
+    # copy-on-write view of a grid: writes go to a dict keyed by cell index and
+    # reads fall through to the base, so trying out a change costs O(changes)
+    # instead of a copy of the whole grid
+    def __init__(self, base: Grid):
+        self.base = base
+        self.height = base.height
+        self.width = base.width
+        self.changes = {}
+        # (index, previous value or _MISSING) for every write, newest last
+        self.log = []
+
+    def snapshot(self) -> int:
+        return len(self.log)
+
+    def rollback(self, snapshot: int = 0) -> None:
+        changes, log = self.changes, self.log
+        while len(log) > snapshot:
+            i, old = log.pop()
+            if old is _MISSING:
+                del changes[i]
+            else:
+                changes[i] = old
+
+    def commit(self) -> None:
+        # writes the changes through to the base and starts over
+        for i, value in self.changes.items():
+            self.base.set_at(i, value)
+        self.changes.clear()
+        self.log.clear()
+
+    def get(self, item: Vec, default: Any = None) -> Any:
+        if not (0 <= item.x < self.width and 0 <= item.y < self.height):
+            return default
+        return self[item]
+
+    def oob(self, pos: Vec) -> bool:
+        return not (0 <= pos.x < self.width and 0 <= pos.y < self.height)
+
+    def find(self, value: Any) -> Vec | None:
+        return next(self.find_iter(value), None)
+
+    def find_iter(self, value: Any) -> Iterator[Vec]:
+        base, changes = self.base, self.changes
+        for pos in base.find_iter(value):
+            if base.index(pos) not in changes:
+                yield pos
+        for i, changed in changes.items():
+            pos = base.pos(i)
+            if changed == value and not self.oob(pos):
+                yield pos
+
+    def items(self) -> Iterator[tuple[Vec, Any]]:
+        for y, row in enumerate(self):
+            for x, val in enumerate(row):
+                yield Vec(x, y), val
+
+    def __getitem__(self, item: Vec) -> Any:
+        base = self.base
+        i = item.y * base.stride + item.x + base.offset
+        value = self.changes.get(i, _MISSING)
+        if value is _MISSING:
+            return base.palette[base.data[i]]
+        return value
+
+    def __setitem__(self, item: Vec, value: Any) -> None:
+        i = self.base.index(item)
+        self.log.append((i, self.changes.get(i, _MISSING)))
+        self.changes[i] = value
+
+    def __repr__(self):
+        return f"Overlay({self.base!r}, changes={len(self.changes)})"
+
+    def __str__(self) -> str:
+        return "\n".join("".join(map(str, row)) for row in self)
+
+    def __iter__(self) -> Iterator[list]:
+        patches = {}
+        for i, value in self.changes.items():
+            pos = self.base.pos(i)
+            if not self.oob(pos):
+                patches.setdefault(pos.y, []).append((pos.x, value))
+        for y, row in enumerate(self.base):
+            for x, value in patches.get(y, ()):
+                row[x] = value
+            yield row
+
+    def __len__(self) -> int:
+        return self.height
+
+
+def map_file(path: Path) -> mmap.mmap:
+    # copy-on-write mapping: pages are loaded lazily and writes never reach the file
+    with path.open("rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+
+def iter_lines(buf: bytes | mmap.mmap) -> Iterator[memoryview]:
+    # zero-copy lines without \n or \r\n; int() and friends need bytes(line)
+    view = memoryview(buf)
+    start = 0
+    while start < len(buf):
+        end = buf.find(b"\n", start)
+        if end == -1:
+            end = len(buf)
+        stop = end - 1 if end > start and buf[end - 1] == 13 else end
+        yield view[start:stop]
+        start = end + 1
 
 
 def flatten(v):